@@ -1,57 +1,78 @@
 import sys
 import math
+import time
+import argparse
 import random
 import pygame
 import os
 
 from scripts.Entities import PhysicsEntity, Player, Enemy
-from scripts.utils import load_image, load_images, Animation
-from scripts.tilemap import Tilemap
+from scripts.utils import TextCache
+from scripts.assets import AssetPipeline, AssetRegistry
+from scripts.tilemap import Tilemap, MAP_EXT, TILE_TYPES
+from scripts.levels import LevelCache, build_level_template
 from scripts.clouds import Clouds
-from scripts.particle import Particle
-from scripts.spark import Spark
+from scripts.particle import ParticleSystem
+from scripts.spark import SparkSystem
+from scripts.projectile import ProjectilePool
+from scripts.outline import OutlineCache, OutlinedSurface
+from scripts.presenter import Presenter, PRESENT_MODES
+from scripts.transition import IrisTransition
+from scripts.viewport import Viewport
+from scripts.profiler import Profiler
 from scripts.ai_player import AIPlayer
+from scripts.clock import GameClock
+
+MAX_STEPS_PER_FRAME = 5 #simulation steps a rendered frame may catch up on, per unit of fast-forward speed
+STEP_TOLERANCE = 0.25 #fraction of a step the accumulator may be short of it and still run it, the loop's sleep wakes up a little early or late
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, present='stretch', profile=False):
+        self.headless = headless #no window, sound or frame cap, for bot test sessions
+        self.profiler = Profiler(enabled=profile)#times each part of the frame, F3 shows the numbers
+        if self.headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pygame.init() #essentially starts pygame with these variables assigned
 
-        pygame.display.set_caption('HP game')
-        self.screen = pygame.display.set_mode((1350, 750))#visual window dimensions
+        if not self.headless:
+            pygame.display.set_caption('HP game')
+        self.presenter = Presenter(present, (500, 270), (1350, 750), headless=self.headless)#visual window dimensions, and how the game frame is scaled up to them
+        self.screen = self.presenter.screen
         self.display = pygame.Surface((500, 270), pygame.SRCALPHA)#allows assets to be drawn larger by using a smaller screen that is then adjusted to fit the main screen
         self.display_2 = pygame.Surface((500, 270))
+        self.iris = IrisTransition(self.display.get_size())
+        self.viewport = Viewport(self.display.get_size())#what the camera sees this frame, objects outside it are not drawn
+        self.outlined_display = OutlinedSurface(self.display, self.display_2, OutlineCache())#draws the drop-shadow outline of everything drawn on it onto display_2
         self.titlecard = True
         self.choosecharacter = False
         self.gameplay = False
         self.ai_enabled = False  # New flag for AI control
         self.characterlist = ['Okarin', 'Bobo',]#List of character names as appears in selection
         self.characters = ['Assets/images/Okarin.png', 'Assets/images/Bobo.png']#character images/sprites
-        self.fps = pygame.time.Clock()
+        self.portraits = [pygame.image.load(path).convert_alpha() for path in self.characters]#loaded once for the character select
+        self.text = TextCache()#menu and HUD text, rendered once
+        self.clock = GameClock()#game time, timers run on this instead of the wall clock
+        self.render_random = random.Random()
         self.i = 0 #increment used to choose character to load
-        self.assets = {
-            'decor': load_images('tiles/decor'),
-            'grass': load_images('tiles/grass'),
-            'large_decor': load_images('tiles/large_decor'),
-            'stone': load_images('tiles/stone'),
-            'background': load_image('background.png'),
-            'clouds' : load_images('clouds'),
-            'enemy/idle': Animation(load_images('entities/enemy/idle'), img_dur=6),
-            'enemy/run': Animation(load_images('entities/enemy/run'), img_dur=4),
-            'player/Bobo/idle' :  Animation(load_images('entities/player/Bobo/idle'), img_dur=6),
-            'player/Bobo/run' :  Animation(load_images('entities/player/Bobo/run'), img_dur=4),
-            'player/Bobo/jump' : Animation(load_images('entities/player/Bobo/jump')),
-            'player/Bobo/slide' : Animation(load_images('entities/player/Bobo/slide')),
-            'player/Bobo/wall_slide' : Animation(load_images('entities/player/Bobo/wall_slide')),
-            'player/Okarin/idle' :  Animation(load_images('entities/player/Okarin/idle'), img_dur=6),
-            'player/Okarin/run' :  Animation(load_images('entities/player/Okarin/run'), img_dur=4),
-            'player/Okarin/jump' : Animation(load_images('entities/player/Okarin/jump')),
-            'player/Okarin/slide' : Animation(load_images('entities/player/Okarin/slide')),
-            'player/Okarin/wall_slide' : Animation(load_images('entities/player/Okarin/wall_slide')),
-            'particle/leaf': Animation(load_images('particles/leaf'), img_dur=20, loop=False),
-            'particle/particle': Animation(load_images('particles/particle'), img_dur=6, loop=False),
-            'gun': load_image('gun.png'),
-            'projectile': load_image('projectile.png'),
-        }#assets to load
+        self.assets = AssetRegistry(AssetPipeline().load())#assets to load, each one the first time it is used
+        for tile_type in TILE_TYPES:
+            self.assets.images(tile_type, 'tiles/' + tile_type, group=tile_type)
+        self.assets.image('background', 'background.png')
+        self.assets.images('clouds', 'clouds')
+        self.assets.animation('enemy/idle', 'entities/enemy/idle', img_dur=6)
+        self.assets.animation('enemy/run', 'entities/enemy/run', img_dur=4)
+        for character in self.characterlist:
+            self.assets.animation('player/' + character + '/idle', 'entities/player/' + character + '/idle', group=character, img_dur=6)
+            self.assets.animation('player/' + character + '/run', 'entities/player/' + character + '/run', group=character, img_dur=4)
+            self.assets.animation('player/' + character + '/jump', 'entities/player/' + character + '/jump', group=character)
+            self.assets.animation('player/' + character + '/slide', 'entities/player/' + character + '/slide', group=character)
+            self.assets.animation('player/' + character + '/wall_slide', 'entities/player/' + character + '/wall_slide', group=character)
+        self.assets.animation('particle/leaf', 'particles/leaf', img_dur=20, loop=False)
+        self.assets.animation('particle/particle', 'particles/particle', img_dur=6, loop=False)
+        self.assets.image('gun', 'gun.png')
+        self.assets.add('gun/flipped', lambda: pygame.transform.flip(self.assets['gun'], True, False))
+        self.assets.image('projectile', 'projectile.png')
 
         self.sfx = {
             'jump' : pygame.mixer.Sound('Assets/sfx/jump.wav'),
@@ -68,222 +89,383 @@ class Game:
         self.movement = [False, False]#x axis movement alone, left and right
 
         self.player = Player(self, (50, 50), (8, 17))#create a player
+        self.player_character = self.i #the character self.player was built for
 
         self.tilemap = Tilemap(self, tile_size=16)#create a tilemap
 
+        self.level_cache = LevelCache(lambda map_id: build_level_template(self.tilemap, self.map_path(map_id)), maxsize=4)
+        self.clouds_level = None
+        self.projectiles = ProjectilePool()
+        self.particles = ParticleSystem(self.assets)
+        self.sparks = SparkSystem()
         self.level = 0
+        self.level_count = len([name for name in os.listdir('Assets/maps') if name.endswith('.json')])
         self.load_level(self.level)
 
         self.screenshake = 0
         
         # Initialize AI player
         self.ai_player = AIPlayer(self)
+        if self.headless:
+            self.ai_player.debug = False #per frame prints would dominate an uncapped session
+
+    def clock_keys(self, event):
+        #P pauses, . steps a single frame while paused, F cycles the fast-forward speed
+        if event.key == pygame.K_p:
+            self.clock.toggle_pause()
+            print("Paused" if self.clock.paused else "Resumed")
+        elif event.key == pygame.K_PERIOD and self.clock.paused:
+            self.clock.step()
+        elif event.key == pygame.K_f:
+            print("Speed: x" + str(self.clock.fast_forward()))
+
+    def start_gameplay(self, character=0, level=0):
+        #skips the title card and character select, used by headless sessions
+        self.i = character
+        self.titlecard = False
+        self.choosecharacter = False
+        self.gameplay = True
+        self.ai_enabled = self.headless
+        self.player = Player(self, (50, 50), (8, 17))
+        self.player_character = character
+        self.prefetch_character()
+        self.level = level
+        self.load_level(self.level)
+
+    def prefetch_character(self):
+        #the chosen character's animations are all loaded now rather than on their first action mid-level, the other characters' are let go
+        for character in self.characterlist:
+            if character == self.characterlist[self.i]:
+                self.assets.prefetch(character)
+            else:
+                self.assets.release(character)
+
+    def map_path(self, map_id):
+        #prefer the binary map, falling back to the json one when it is missing or older
+        path = 'Assets/maps/' + str(map_id)
+        if os.path.exists(path + MAP_EXT) and os.path.getmtime(path + MAP_EXT) >= os.path.getmtime(path + '.json'):
+            return path + MAP_EXT
+        return path + '.json'
 
     def load_level(self, map_id):
-        self.tilemap.load('Assets/maps/' + str(map_id) + '.json')
+        #respawns hit the level cache, so they only reset state instead of re-reading the map
+        level = self.level_cache.get(map_id)
+        self.tilemap.apply_template(level)
+        #only the tile sets this level uses stay loaded, headless sessions never draw them
+        for tile_type in TILE_TYPES:
+            if tile_type in level.tile_types and not self.headless:
+                self.assets.prefetch(tile_type)
+            else:
+                self.assets.release(tile_type)
         
-        self.leaf_spawners = []
-        for tree in self.tilemap.extract([('large_decor', 2)], keep=True):
-            self.leaf_spawners.append(pygame.Rect(4 + tree['pos'][0], 4 + tree['pos'][1], 23, 13))
+        self.leaf_spawners = [pygame.Rect(rect) for rect in level.leaf_spawners]
     
-        self.enemies = []
-        for spawner in self.tilemap.extract([('spawners', 0), ('spawners', 1)]):
-            if spawner['variant'] == 0:
-                self.player.pos = spawner['pos']
-                self.pos = spawner['pos']
-                self.player.air_time = 0
-            else:
-                self.enemies.append(Enemy(self, spawner['pos'], (8, 15)))
+        if level.player_spawn:
+            self.player.pos = list(level.player_spawn)
+            self.pos = self.player.pos
+            self.player.air_time = 0
+        self.enemies = [Enemy(self, pos, (8, 15)) for pos in level.enemy_spawns]
         
-        self.projectiles = []
-        self.particles = []
-        self.sparks = []
+        self.projectiles.clear()
+        self.particles.clear()
+        self.sparks.clear()
         
         self.scroll = [0, 0]
         self.dead = 0
         self.transition = -60
 
-        self.clouds = Clouds(self.assets['clouds'], count=16)#create clouds
+        if self.clouds_level != map_id:
+            self.clouds = Clouds(self.assets['clouds'], count=16)#create clouds
+            self.clouds_level = map_id
 
-    def run(self):
-        pygame.mixer.music.load('Assets/music.mp3')
-        pygame.mixer.music.set_volume(0.1)
-        pygame.mixer.music.play(-1)
+    def handle_events(self):
+        for event in pygame.event.get():
+            if not self.gameplay:
+                self.screen.fill('black')#fills screen black to avoid stacking of elements
+            if event.type == pygame.QUIT:
+                self.write_profile()
+                pygame.quit()
+                sys.exit()
+            
+            # Global TAB key handler for AI toggle
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB and self.gameplay:
+                self.ai_enabled = not self.ai_enabled
+                print("AI Control:", "Enabled" if self.ai_enabled else "Disabled")
+            if event.type == pygame.KEYDOWN and self.gameplay:
+                self.clock_keys(event)
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+            
+            if self.titlecard:
+                self.titletext = self.text.render('Press ANY KEY to START ', 43, '#b68f40')
+                self.enter = self.text.render('(TAB to toggle AI Tester)', 40, 'white')
+                self.box = self.titletext.get_rect(center=(675, 300))
+                self.box2 = self.enter.get_rect(center=(675, 525))
+                self.screen.blit(self.titletext, self.box)
+                self.screen.blit(self.enter, self.box2)
+            elif self.choosecharacter:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
+                        self.i = (self.i - 1) % 2
+                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+                        self.i = (self.i + 1) % 2
+                    elif event.key == pygame.K_RETURN:
+                        self.choosecharacter = False
+                        self.transition = -60
+                        self.gameplay = True
+                        self.player_character = None #start gameplay with a fresh player
+                        self.prefetch_character()
 
-        while True:
-            self.display.fill((0, 0, 0, 0))
-            self.display_2.blit(self.assets['background'], (0, 0))#use background image
+                if self.player_character != self.i:
+                    self.player = Player(self, (50, 50), (8, 17))
+                    self.player.pos = self.pos
+                    self.player_character = self.i
+                self.img = self.portraits[self.i]
+                self.img_position = (600, 300)
+                self.arrow_left = self.text.render('<', 75, 'white')
+                self.arrow_right = self.text.render('>', 75, 'white')
+                self.arrow_left_box = self.arrow_left.get_rect(center=(150, 375))
+                self.arrow_right_box = self.arrow_right.get_rect(center=(1200, 375))
+                self.entertext = self.text.render('Press ENTER to SELECT CHARACTER', 37, 'white')
+                self.charactertext = self.text.render(self.characterlist[self.i], 45, 'white')
+                self.characterbox = self.charactertext.get_rect(center=(675, 600))
+                self.enterbox = self.entertext.get_rect(center=(675, 113))
+                self.screen.blit(self.arrow_left, self.arrow_left_box)
+                self.screen.blit(self.arrow_right, self.arrow_right_box)
+                self.screen.blit(self.img, self.img_position)
+                self.screen.blit(self.entertext, self.enterbox)
+                self.screen.blit(self.charactertext, self.characterbox)
 
-            self.screenshake = max(0, self.screenshake - 1)
+            if self.titlecard and event.type == pygame.KEYDOWN:
+                self.titlecard = False
+                self.choosecharacter = True
+            if self.gameplay and not self.ai_enabled:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
+                        self.movement[0] = True
+                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+                        self.movement[1] = True
+                    if event.key == pygame.K_UP or event.key == pygame.K_w:
+                        if self.player.jump():
+                            self.sfx['jump'].play()
+                    if event.key == pygame.K_x or event.key == pygame.K_LSHIFT:
+                        self.player.dash()
+                if event.type == pygame.KEYUP:
+                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:
+                        self.movement[0] = False
+                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+                        self.movement[1] = False
 
-            if not len(self.enemies):
-                self.transition += 1
-                if self.transition > 60:
-                    self.level = min(self.level + 1, len(os.listdir('Assets/maps')) - 1)
-                    self.load_level(self.level)
-            if self.transition < 0:
-                self.transition += 1
+    def step(self):
+        #advances the clock and simulates one step, False when paused with no step pending
+        if not self.clock.advance():
+            return False
+        self.simulate_step()
+        return True
 
-            if self.dead:
-                self.dead += 1
-                if self.dead == 20:
-                    self.transition = min(60, self.transition + 1)
-                if self.dead > 40:
-                    self.load_level(self.level)
+    def simulate_step(self):
+        #one fixed 1/60s step of the game, everything but drawing, only called through step() so the clock keeps up
+        self.screenshake = max(0, self.screenshake - 1)
 
-            self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 25 #cretes a camera as scroll continues using player position etc, the further and quicker the player gets the quicker the camera is
-            self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 25
-            render_scroll = (int(self.scroll[0]), int(self.scroll[1]))#the scroll we use to render approximating using int()
+        if not len(self.enemies):
+            self.transition += 1
+            if self.transition > 60:
+                self.level = min(self.level + 1, self.level_count - 1)
+                self.load_level(self.level)
+        if self.transition < 0:
+            self.transition += 1
 
+        if self.dead:
+            self.dead += 1
+            if self.dead == 20:
+                self.transition = min(60, self.transition + 1)
+            if self.dead > 40:
+                self.load_level(self.level)
+
+        self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 25 #cretes a camera as scroll continues using player position etc, the further and quicker the player gets the quicker the camera is
+        self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 25
+
+        profiler = self.profiler
+        with profiler.section('leaves'):
             for rect in self.leaf_spawners:
                 if random.random() * 49999 < rect.width * rect.height:#in the area of our rectangle
                     pos = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
-                    self.particles.append(Particle(self, 'leaf', pos, velocity=[-0.1, 0.3], frame=random.randint(0, 20)))
+                    self.particles.spawn('leaf', pos, velocity=(-0.1, 0.3), frame=random.randint(0, 20))
 
-            self.clouds.update()#puts clouds on screen
-            self.clouds.render(self.display_2, offset=render_scroll)#renders and scrolls clouds
-
-            self.tilemap.render(self.display, offset=render_scroll)#renders and scrolls tilemaps
+        self.clouds.update()#puts clouds on screen
 
+        with profiler.section('enemies'):
             for enemy in self.enemies.copy():
                 kill = enemy.update(self.tilemap, (0, 0))
-                enemy.render(self.display, offset=render_scroll)
                 if kill:
                     self.enemies.remove(enemy)
-                
+            
+        with profiler.section('player'):
             if not self.dead:
                 self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0))
-                self.player.render(self.display, offset=render_scroll)
-    
-            # [[x, y], direction, timer]
-            for projectile in self.projectiles.copy():
-                projectile[0][0] += projectile[1]
-                projectile[2] += 1
-                img = self.assets['projectile']
-                self.display.blit(img, (projectile[0][0] - img.get_width() / 2 - render_scroll[0], projectile[0][1] - img.get_height() / 2 - render_scroll[1]))
-                if self.tilemap.solid_check(projectile[0]):
-                    self.projectiles.remove(projectile)
-                    for i in range(4):
-                        self.sparks.append(Spark(projectile[0], random.random() - 0.5 + (math.pi if projectile[1] > 0 else 0), 2 + random.random()))
-                elif projectile[2] > 360:
-                    self.projectiles.remove(projectile)
-                elif abs(self.player.dashing) < 50:
-                    if self.player.rect().collidepoint(projectile[0]):
-                        self.projectiles.remove(projectile)
-                        self.dead += 1
-                        self.sfx['hit'].play()
-                        self.screenshake = max(16, self.screenshake)
-                        for i in range(30):
-                            angle = random.random() * math.pi * 2
-                            speed = random.random() * 5
-                            self.sparks.append(Spark(self.player.rect().center, angle, 2 + random.random()))
-                            self.particles.append(Particle(self, 'particle', self.player.rect().center, velocity=[math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], frame=random.randint(0, 7)))
-
-            for spark in self.sparks.copy():
-                kill = spark.update()
-                spark.render(self.display, offset=render_scroll)
-                if kill:
-                    self.sparks.remove(spark)
 
-            display_mask = pygame.mask.from_surface(self.display)
-            display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
-            for offset in [(-1, 0), (1, 0), (0,-1), (0, 1)]:
-                self.display_2.blit(display_silhouette, offset)
-            
-            for particle in self.particles.copy():
-                kill = particle.update()
-                particle.render(self.display, offset=render_scroll)
-                if particle.type == 'leaf':
-                    particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
-                if kill:
-                    self.particles.remove(particle)
+        with profiler.section('projectiles'):
+            wall_hits, player_hits = self.projectiles.update(self.tilemap, self.player.rect() if abs(self.player.dashing) < 50 else None)
+        for pos, velocity in wall_hits:
+            for i in range(4):
+                self.sparks.spawn(pos, random.random() - 0.5 + (math.pi if velocity > 0 else 0), 2 + random.random())
+        for hit in range(player_hits):
+            self.dead += 1
+            self.sfx['hit'].play()
+            self.screenshake = max(16, self.screenshake)
+            for i in range(30):
+                angle = random.random() * math.pi * 2
+                speed = random.random() * 5
+                self.sparks.spawn(self.player.rect().center, angle, 2 + random.random())
+                self.particles.spawn('particle', self.player.rect().center, velocity=(math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5), frame=random.randint(0, 7))
 
-            for event in pygame.event.get():
-                self.screen.fill('black')#fills screen black to avoid stacking of elements
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                # Global TAB key handler for AI toggle
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB and self.gameplay:
-                    self.ai_enabled = not self.ai_enabled
-                    print("AI Control:", "Enabled" if self.ai_enabled else "Disabled")
-                
-                if self.titlecard:
-                    self.titletext = pygame.font.Font("Assets/font.ttf", 43).render('Press ANY KEY to START ', True, '#b68f40')
-                    self.enter = pygame.font.Font("Assets/font.ttf", 40).render('(TAB to toggle AI Tester)', True, 'white')
-                    self.box = self.titletext.get_rect(center=(675, 300))
-                    self.box2 = self.enter.get_rect(center=(675, 525))
-                    self.screen.blit(self.titletext, self.box)
-                    self.screen.blit(self.enter, self.box2)
-                elif self.choosecharacter:
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                            self.i = (self.i - 1) % 2
-                        elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                            self.i = (self.i + 1) % 2
-                        elif event.key == pygame.K_RETURN:
-                            self.choosecharacter = False
-                            self.transition = -60
-                            self.gameplay = True
+        with profiler.section('sparks'):
+            self.sparks.update()
+        
+        with profiler.section('particles'):
+            self.particles.update()
 
-                    self.player = Player(self, (50, 50), (8, 17))
-                    self.player.pos = self.pos
-                    self.img = pygame.image.load(self.characters[self.i])
-                    self.img_position = (600, 300)
-                    self.arrow_left = pygame.font.Font('Assets/font.ttf', 75).render('<', True, 'white')
-                    self.arrow_right = pygame.font.Font('Assets/font.ttf', 75).render('>', True, 'white')
-                    self.arrow_left_box = self.arrow_left.get_rect(center=(150, 375))
-                    self.arrow_right_box = self.arrow_right.get_rect(center=(1200, 375))
-                    self.entertext = pygame.font.Font('Assets/font.ttf', 37).render('Press ENTER to SELECT CHARACTER', True, 'white')
-                    self.charactertext = pygame.font.Font('Assets/font.ttf', 45).render(self.characterlist[self.i], True, 'white')
-                    self.characterbox = self.charactertext.get_rect(center=(675, 600))
-                    self.enterbox = self.entertext.get_rect(center=(675, 113))
-                    self.screen.blit(self.arrow_left, self.arrow_left_box)
-                    self.screen.blit(self.arrow_right, self.arrow_right_box)
-                    self.screen.blit(self.img, self.img_position)
-                    self.screen.blit(self.entertext, self.enterbox)
-                    self.screen.blit(self.charactertext, self.characterbox)
-
-                if self.titlecard and event.type == pygame.KEYDOWN:
-                    self.titlecard = False
-                    self.choosecharacter = True
-                if self.gameplay and not self.ai_enabled:
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                            self.movement[0] = True
-                        if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                            self.movement[1] = True
-                        if event.key == pygame.K_UP or event.key == pygame.K_w:
-                            if self.player.jump():
-                                self.sfx['jump'].play()
-                        if event.key == pygame.K_x or event.key == pygame.K_LSHIFT:
-                            self.player.dash()
-                    if event.type == pygame.KEYUP:
-                        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                            self.movement[0] = False
-                        if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                            self.movement[1] = False
-
-            # Update AI if enabled
-            if self.gameplay and self.ai_enabled and not self.dead:
+        with profiler.section('events'):
+            self.handle_events()
+
+        # Update AI if enabled
+        if self.gameplay and self.ai_enabled and not self.dead:
+            with profiler.section('ai'):
                 self.ai_player.update()
 
-            if self.gameplay:
-                # Add AI status indicator
-                ai_text = pygame.font.Font("Assets/font.ttf", 20).render('AI: ' + ('ON' if self.ai_enabled else 'OFF') + ' (TAB to toggle)', True, 'white')
-                self.screen.blit(ai_text, (20, 20))
-
-            if self.gameplay:
-                if self.transition:
-                    transition_surf = pygame.Surface(self.display.get_size())
-                    pygame.draw.circle(transition_surf, (255, 255, 255), (self.display.get_width() // 2, self.display.get_height() // 2), (60 - abs(self.transition)) * 8)
-                    transition_surf.set_colorkey((255, 255, 255))
-                    self.display.blit(transition_surf, (0, 0))
+    def render_frame(self):
+        render_scroll = (int(self.scroll[0]), int(self.scroll[1]))#the scroll we use to render approximating using int()
+
+        profiler = self.profiler
+        with profiler.section('render/background'):
+            self.display.fill((0, 0, 0, 0))
+            self.display_2.blit(self.assets['background'], (0, 0))#use background image
+
+            self.clouds.render(self.display_2, offset=render_scroll)#renders and scrolls clouds
+
+        outlined = self.outlined_display
+        with profiler.section('render/tilemap'):
+            self.tilemap.render(outlined, offset=render_scroll)#renders and scrolls tilemaps
+
+        viewport = self.viewport
+        viewport.move(render_scroll)
+        with profiler.section('render/entities'):
+            for enemy in self.enemies:
+                if viewport.sees(enemy.rect(), 'enemies'):
+                    enemy.render(outlined, offset=render_scroll)
+
+            if not self.dead and viewport.sees(self.player.rect(), 'player'):
+                self.player.render(outlined, offset=render_scroll)
+
+        with profiler.section('render/projectiles'):
+            self.projectiles.render(outlined, self.assets['projectile'], offset=render_scroll, viewport=viewport)
+
+        with profiler.section('render/sparks'):
+            self.sparks.render(outlined, offset=render_scroll, viewport=viewport)
+
+        with profiler.section('render/particles'):
+            self.particles.render(self.display, offset=render_scroll, viewport=viewport)
+
+        if self.gameplay:
+            with profiler.section('render/present'):
+                self.iris.render(self.display, self.transition)
                 self.display_2.blit(self.display, (0, 0))
-                screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
-                self.screen.blit(pygame.transform.scale(self.display_2, self.screen.get_size()), screenshake_offset)#creates a display to increase size of small assets                  
-            pygame.display.update() #constantly refreshes screen
-            self.fps.tick(60)
+                #its own random stream, so how often we render doesn't change the simulation's random numbers
+                screenshake_offset = (self.render_random.random() * self.screenshake - self.screenshake / 2, self.render_random.random() * self.screenshake - self.screenshake / 2)
+                self.presenter.present(self.display_2, screenshake_offset)#scales the small display up to the window
+
+            # Add AI status indicator
+            ai_text = self.text.render('AI: ' + ('ON' if self.ai_enabled else 'OFF') + ' (TAB to toggle)', 20, 'white')
+            self.presenter.overlay(ai_text, (20, 20))
+            if profiler.show_overlay:
+                self.presenter.overlay(profiler.overlay(self.text.font(20, None)), (20, 60))#pygame's default font, compact enough for the table
+
+    def run(self, max_frames=None, stop_on_bug=False, render_every=1):
+        #fixed timestep: the simulation always advances in 1/60s steps, running several per rendered frame
+        #when behind (or fast-forwarding) and rendering only every render_every frames
+        if not self.headless:
+            pygame.mixer.music.load('Assets/music.mp3')
+            pygame.mixer.music.set_volume(0.1)
+            pygame.mixer.music.play(-1)
+
+        frames = 0
+        loops = 0
+        accumulator = 0
+        start_time = last_time = time.perf_counter()
+        while True:
+            if self.headless:
+                steps = 1 #uncapped, no real time to keep up with
+            elif self.clock.paused:
+                steps = self.clock.pending_steps
+                accumulator = 0
+                last_time = time.perf_counter()
+            else:
+                now = time.perf_counter()
+                accumulator += (now - last_time) * self.clock.speed
+                last_time = now
+                #a loop that came up just short takes its step anyway (the accumulator goes slightly negative and evens out),
+                #rather than alternating 0 and 2 steps around the 60 Hz cap
+                steps = int(accumulator * self.clock.fps + STEP_TOLERANCE)
+                accumulator -= steps / self.clock.fps
+                if steps > MAX_STEPS_PER_FRAME * self.clock.speed:
+                    #too far behind to catch up, drop the backlog instead of spiralling
+                    steps = MAX_STEPS_PER_FRAME * self.clock.speed
+                    accumulator = 0
+
+            if not steps:
+                with self.profiler.section('events'):
+                    self.handle_events()
+            for step in range(steps):
+                if not self.step():
+                    self.handle_events()
+                    break
+                frames += 1
+                bugs = sum(self.ai_player.bugs_this_session.values())
+                if (max_frames and frames >= max_frames) or (stop_on_bug and bugs):
+                    elapsed = time.perf_counter() - start_time
+                    print(f"Session over: {frames} frames in {elapsed:.1f}s ({frames / max(elapsed, 1e-9):.0f} frames/s), level {self.level}, {bugs} bugs {self.ai_player.bugs_this_session}")
+                    self.write_profile()
+                    return bugs
+
+            if not self.headless:
+                loops += 1
+                if loops % render_every == 0:
+                    self.render_frame()
+                    with self.profiler.section('render/update'):
+                        self.presenter.update(menus=not self.gameplay) #constantly refreshes screen
+                with self.profiler.section('idle'):
+                    #sleep until the next step is due, pygame's Clock.tick(60) waits whole milliseconds (16ms, 62.5 Hz) and would skip a step every 25 frames
+                    delay = last_time + (1 / self.clock.fps - accumulator) / self.clock.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            self.profiler.end_frame()
+
+    def write_profile(self):
+        #on exit, the percentiles to the console and every kept frame's timings to the CSV
+        path = self.profiler.dump()
+        if path:
+            print('\n'.join(self.profiler.summary()))
+            print("Profile written to", path)
+
+def main():
+    parser = argparse.ArgumentParser(description='HP game, optionally as a headless AI test session')
+    parser.add_argument('--headless', action='store_true', help='no window, sound or frame cap, the AI plays')
+    parser.add_argument('--character', choices=['Okarin', 'Bobo'], help='start gameplay directly with this character')
+    parser.add_argument('--level', type=int, help='start gameplay directly on this level')
+    parser.add_argument('--frames', type=int, help='stop after this many frames')
+    parser.add_argument('--stop-on-bug', action='store_true', help='stop at the first bug the AI detects')
+    parser.add_argument('--present', choices=PRESENT_MODES, default='stretch', help='how the game frame is scaled to the window: stretch, integer (largest whole factor, centered), gpu (SDL scaled mode) or dirty (integer, redrawing only what changed)')
+    parser.add_argument('--render-every', type=int, default=1, help='draw only every Nth frame, the simulation still runs at 60 steps a second')
+    parser.add_argument('--profile', action='store_true', help='time each part of the frame, printing the percentiles and writing the last 600 frames to Logs/profile.csv on exit')
+    args = parser.parse_args()
+
+    game = Game(headless=args.headless, present=args.present, profile=args.profile)
+    if args.level is not None and not 0 <= args.level < game.level_count:
+        parser.error(f'--level {args.level} does not exist, the levels are 0 to {game.level_count - 1}')
+    if args.headless or args.character or args.level is not None:
+        game.start_gameplay(game.characterlist.index(args.character or 'Okarin'), args.level or 0)
+    bugs = game.run(max_frames=args.frames, stop_on_bug=args.stop_on_bug, render_every=max(1, args.render_every))
+    sys.exit(1 if bugs else 0)
 
-Game().run() 
+if __name__ == '__main__':
+    main() 
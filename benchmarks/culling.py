@@ -0,0 +1,71 @@
+#measures render_frame time with the viewport culling against drawing every enemy, projectile, spark and particle, how many of them are drawn and culled per frame,
+#and that the frames come out the same, replaying a seeded AI session, run from the repo root: python benchmarks/culling.py
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+from Hpgame import Game
+from scripts.viewport import Viewport
+
+FRAMES = 600
+LEVELS = [0, 1, 2]
+BURST_EVERY = 60 #frames between the bursts of particles and sparks spread over the level, like the deaths of the enemies the AI shoots
+BURST_SIZE = 30
+
+def burst(game):
+    #bursts all over the level, most of them off screen
+    for i in range(BURST_SIZE):
+        pos = (random.uniform(-600, 2000), random.uniform(-400, 900))
+        game.sparks.spawn(pos, random.uniform(0, 6.28), 2 + random.random())
+        game.particles.spawn('particle', pos, velocity=(random.uniform(-1, 1), random.uniform(-1, 1)), frame=random.randint(0, 7))
+
+def timed_render(game, viewport):
+    game.viewport = viewport
+    start = time.perf_counter()
+    game.render_frame()
+    return time.perf_counter() - start
+
+def run(level):
+    random.seed(level)
+    game = Game(headless=True)
+    game.start_gameplay(0, level)
+    game.ai_player.generate_bug_report = lambda *args, **kwargs: None
+    culling = Viewport(game.display.get_size())
+    everything = Viewport(game.display.get_size(), margin=10 ** 9)
+
+    old_time = new_time = 0
+    drawn = culled = 0
+    mismatches = 0
+    for frame in range(FRAMES):
+        game.step()
+        if frame % BURST_EVERY == 0:
+            burst(game)
+
+        #the same state rendered both ways, nothing the frame shows moves between the two
+        old_time += timed_render(game, everything)
+        old_frame = pygame.image.tobytes(game.display_2, 'RGB')
+        new_time += timed_render(game, culling)
+        mismatches += pygame.image.tobytes(game.display_2, 'RGB') != old_frame
+
+        frame_drawn, frame_culled = culling.totals()
+        drawn += frame_drawn
+        culled += frame_culled
+    return old_time / FRAMES, new_time / FRAMES, drawn / FRAMES, culled / FRAMES, mismatches
+
+def main():
+    print(f'{FRAMES} frames of an AI session per level, {BURST_SIZE} sparks and particles spread over the level every {BURST_EVERY} frames')
+    print(f'{"level":<8}{"draw all":>12}{"culled":>12}{"speedup":>10}{"drawn/frame":>14}{"culled/frame":>14}{"mismatched frames":>20}')
+    for level in LEVELS:
+        old, new, drawn, culled, mismatches = run(level)
+        print(f'{level:<8}{old * 1000:10.3f}ms{new * 1000:10.3f}ms{old / new:9.2f}x{drawn:14.1f}{culled:14.1f}{mismatches:20}')
+        assert not mismatches, 'culling changed what the frame shows'
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#compares json and binary map loading as done by Game.load_level on respawn and level transitions
+#run from the repo root: python benchmarks/level_load.py
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scripts.tilemap import Tilemap, MAP_EXT
+
+RUNS = 200
+
+class AssetlessGame:
+    assets = {}
+
+def reload_level(path):
+    #the tilemap part of Game.load_level
+    tilemap = Tilemap(AssetlessGame(), tile_size=16)
+    tilemap.load(path)
+    tilemap.extract([('large_decor', 2)], keep=True)
+    tilemap.extract([('spawners', 0), ('spawners', 1)])
+    return tilemap
+
+def average_ms(path):
+    start = time.perf_counter()
+    for i in range(RUNS):
+        reload_level(path)
+    return (time.perf_counter() - start) / RUNS * 1000
+
+def main():
+    print(f'{"map":<22}{"json":>10}{"binary":>10}{"speedup":>10}')
+    for name in sorted(os.listdir('Assets/maps')):
+        if not name.endswith('.json'):
+            continue
+        json_path = 'Assets/maps/' + name
+        binary_path = os.path.splitext(json_path)[0] + MAP_EXT
+        if not os.path.exists(binary_path):
+            print(f'{json_path:<22}no {binary_path}, run python -m scripts.convert_maps')
+            continue
+        json_ms = average_ms(json_path)
+        binary_ms = average_ms(binary_path)
+        print(f'{json_path:<22}{json_ms:>8.2f}ms{binary_ms:>8.2f}ms{json_ms / binary_ms:>9.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#measures NavGraph.find_path (A*) against plain Dijkstra over every pair of segments of each map and character,
+#and checks that A* always finds a path as cheap as Dijkstra's, run from the repo root: python benchmarks/navigation.py
+import heapq
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scripts.tilemap import Tilemap
+from scripts.navigation import NavGraph, CHARACTER_MOVES
+
+class AssetlessGame:
+    assets = {}
+
+def load_tilemap(path):
+    #the tilemap part of Game.load_level
+    tilemap = Tilemap(AssetlessGame(), tile_size=16)
+    tilemap.load(path)
+    tilemap.extract([('large_decor', 2)], keep=True)
+    tilemap.extract([('spawners', 0), ('spawners', 1)])
+    return tilemap
+
+def dijkstra(graph, start):
+    #the cheapest cost from start to every reachable segment
+    best = {start.index: 0}
+    heap = [(0, start.index)]
+    while heap:
+        cost, index = heapq.heappop(heap)
+        if cost > best[index]:
+            continue
+        for edge in graph.edges[index]:
+            new_cost = cost + edge.cost
+            if new_cost < best.get(edge.target.index, float('inf')):
+                best[edge.target.index] = new_cost
+                heapq.heappush(heap, (new_cost, edge.target.index))
+    return best
+
+def main():
+    #A* is timed for every pair of segments, Dijkstra for every start segment (one run reaches all goals)
+    print(f'{"map":<22}{"character":<12}{"paths":>8}{"A*, pairs":>14}{"dijkstra":>12}')
+    for name in sorted(os.listdir('Assets/maps')):
+        if not name.endswith('.json'):
+            continue
+        tilemap = load_tilemap('Assets/maps/' + name)
+        for character, (jumps, dashes) in CHARACTER_MOVES.items():
+            graph = NavGraph(tilemap, jumps=jumps, dashes=dashes)
+            pairs = [(start, goal) for start in graph.segments for goal in graph.segments if start is not goal]
+
+            start_time = time.perf_counter()
+            paths = [graph.find_path(start, goal) for start, goal in pairs]
+            astar_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            optimal = {start.index: dijkstra(graph, start) for start in graph.segments}
+            dijkstra_time = time.perf_counter() - start_time
+
+            for (start, goal), path in zip(pairs, paths):
+                best = optimal[start.index].get(goal.index)
+                assert (path is None) == (best is None), f'{name} {character}: A* and Dijkstra disagree on reaching segment {goal.index} from {start.index}'
+                if path is not None:
+                    cost = sum(edge.cost for edge in path)
+                    assert abs(cost - best) < 1e-6, f'{name} {character}: A* path from segment {start.index} to {goal.index} costs {cost:.1f}, the cheapest is {best:.1f}'
+            found = sum(1 for path in paths if path is not None)
+            print(f'{name:<22}{character:<12}{found:>8}{astar_time * 1000:>12.2f}ms{dijkstra_time * 1000:>10.2f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#measures render_frame time with the old full-screen mask outline pass against the cached per-image outlines, and how many pixels of the frame differ, run from the repo root: python benchmarks/outlines.py
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+from Hpgame import Game
+
+FRAMES = 600
+COMPARE_EVERY = 50
+
+def legacy_render_frame(game):
+    #render_frame drawing straight onto the display, masking the whole of it just before the particles like the game used to
+    outlined = game.outlined_display
+    particles_render = game.particles.render
+    def render(surf, offset=(0, 0), viewport=None):
+        display_mask = pygame.mask.from_surface(game.display)
+        display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
+        for shift in [(-1, 0), (1, 0), (0,-1), (0, 1)]:
+            game.display_2.blit(display_silhouette, shift)
+        particles_render(surf, offset=offset, viewport=viewport)
+    game.outlined_display = game.display
+    game.particles.render = render
+    game.render_frame()
+    game.outlined_display = outlined
+    game.particles.render = particles_render
+
+def differing_pixels(a, b, tolerance=2):
+    a = pygame.image.tobytes(a, 'RGB')
+    b = pygame.image.tobytes(b, 'RGB')
+    return sum(1 for i in range(0, len(a), 3) if max(abs(a[i] - b[i]), abs(a[i + 1] - b[i + 1]), abs(a[i + 2] - b[i + 2])) > tolerance)
+
+def main():
+    random.seed(0)
+    game = Game(headless=True)
+    game.start_gameplay(0, 0)
+    game.ai_player.generate_bug_report = lambda *args, **kwargs: None
+
+    old_time = new_time = 0
+    diffs = []
+    for frame in range(FRAMES):
+        game.step()
+
+        start = time.perf_counter()
+        legacy_render_frame(game)
+        old_time += time.perf_counter() - start
+        old_frame = game.display_2.copy()
+
+        start = time.perf_counter()
+        game.render_frame()
+        new_time += time.perf_counter() - start
+
+        if frame % COMPARE_EVERY == 0:
+            diffs.append(differing_pixels(old_frame, game.display_2))
+
+    pixels = game.display_2.get_width() * game.display_2.get_height()
+    print(f'{FRAMES} frames of an AI session on level 0, {game.display.get_width()}x{game.display.get_height()} display')
+    print(f'mask pass      {old_time / FRAMES * 1000:8.3f}ms per frame')
+    print(f'cached outline {new_time / FRAMES * 1000:8.3f}ms per frame ({old_time / new_time:.2f}x)')
+    print(f'differing pixels on {len(diffs)} sampled frames: max {max(diffs)} of {pixels}, mean {sum(diffs) / len(diffs):.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#measures particle update + render time per frame with the old one-object-per-particle Particle against the ParticleSystem pool, run from the repo root: python benchmarks/particles.py
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scripts.utils import load_images, Animation
+from scripts.particle import ParticleSystem
+
+FRAMES = 600
+BURSTS = [1, 5, 20] #30 particle bursts (one death) spawned per frame
+LEAVES = 2 #leaves spawned per frame
+
+class LegacyParticle:
+    #the old Particle, plus the leaf sway the game loop used to apply
+    def __init__(self, assets, p_type, pos, velocity=[0, 0], frame=0):
+        self.type = p_type
+        self.pos = list(pos)
+        self.velocity = list(velocity)
+        self.animation = assets['particle/' + p_type].copy()
+        self.animation.frame = frame
+
+    def update(self):
+        kill = False
+        if self.animation.done:
+            kill = True
+        self.pos[0] += self.velocity[0]
+        self.pos[1] += self.velocity[1]
+        self.animation.update()
+        return kill
+
+    def render(self, surf, offset=(0, 0)):
+        img = self.animation.img()
+        surf.blit(img, (self.pos[0] - offset[0] - img.get_width() // 2, self.pos[1] - offset[1] - img.get_height() // 2))
+
+def spawns(bursts):
+    #the same random spawns for both versions: (type, pos, velocity, frame)
+    frames = []
+    for frame in range(FRAMES):
+        spawned = [('leaf', (random.uniform(0, 320), random.uniform(0, 60)), (-0.1, 0.3), random.randint(0, 20)) for i in range(LEAVES)]
+        for burst in range(bursts):
+            center = (random.uniform(0, 320), random.uniform(0, 240))
+            for i in range(30):
+                angle = random.random() * math.pi * 2
+                speed = random.random() * 5
+                spawned.append(('particle', center, (math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5), random.randint(0, 7)))
+        frames.append(spawned)
+    return frames
+
+def run_legacy(assets, surf, frames):
+    particles = []
+    times = []
+    for spawned in frames:
+        start = time.perf_counter()
+        for p_type, pos, velocity, frame in spawned:
+            particles.append(LegacyParticle(assets, p_type, pos, velocity=velocity, frame=frame))
+        for particle in particles.copy():
+            kill = particle.update()
+            if particle.type == 'leaf':
+                particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
+            if kill:
+                particles.remove(particle)
+        for particle in particles:
+            particle.render(surf)
+        times.append(time.perf_counter() - start)
+    return times, sorted((round(p.pos[0], 6), round(p.pos[1], 6), p.animation.frame) for p in particles)
+
+def run_pool(assets, surf, frames):
+    particles = ParticleSystem(assets)
+    times = []
+    for spawned in frames:
+        start = time.perf_counter()
+        for p_type, pos, velocity, frame in spawned:
+            particles.spawn(p_type, pos, velocity=velocity, frame=frame)
+        particles.update()
+        particles.render(surf)
+        times.append(time.perf_counter() - start)
+    count = particles.count
+    return times, sorted((round(x, 6), round(y, 6), frame) for x, y, frame in zip(particles.x[:count], particles.y[:count], particles.frame))
+
+def main():
+    pygame.display.set_mode((1, 1))
+    assets = {
+        'particle/leaf': Animation(load_images('particles/leaf'), img_dur=20, loop=False),
+        'particle/particle': Animation(load_images('particles/particle'), img_dur=6, loop=False),
+    }
+    surf = pygame.Surface((320, 240), pygame.SRCALPHA)
+    random.seed(0)
+
+    print(f'{FRAMES} frames, {LEAVES} leaves per frame plus 30 particle bursts')
+    print(f'{"bursts":<8}{"live":>8}{"objects avg/max":>22}{"pool avg/max":>22}{"speedup":>10}')
+    for bursts in BURSTS:
+        frames = spawns(bursts)
+        old_times, old_state = run_legacy(assets, surf, frames)
+        new_times, new_state = run_pool(assets, surf, frames)
+        assert old_state == new_state
+        old_avg = sum(old_times) / len(old_times)
+        new_avg = sum(new_times) / len(new_times)
+        print(f'{bursts:<8}{len(new_state):>8}{old_avg * 1000:>12.3f}/{max(old_times) * 1000:.3f}ms{new_avg * 1000:>12.3f}/{max(new_times) * 1000:.3f}ms{old_avg / new_avg:>9.2f}x')
+
+if __name__ == '__main__':
+    main()
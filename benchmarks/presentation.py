@@ -0,0 +1,74 @@
+#measures the time to put a game frame on the window in each presentation mode, against the old transform.scale into a new surface every frame,
+#replaying frames recorded from an AI session, run from the repo root: python benchmarks/presentation.py
+#with SDL's dummy video driver (no display) the gpu mode's scaling is done by SDL's software renderer, so its numbers only mean something on a real display
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+from Hpgame import Game
+from scripts.presenter import Presenter, PRESENT_MODES
+
+FRAMES = 200
+FRAME_SIZE = (500, 270)
+WINDOW_SIZE = (1350, 750)
+
+def record():
+    #the frames (and screenshake offsets) of a seeded AI session, as render_frame presents them
+    random.seed(0)
+    game = Game(headless=True)
+    game.start_gameplay(0, 0)
+    game.ai_player.generate_bug_report = lambda *args, **kwargs: None
+    frames = []
+    game.presenter.present = lambda frame, offset=(0, 0): frames.append((frame.copy(), offset))
+    while len(frames) < FRAMES:
+        game.step()
+        game.render_frame()
+    return frames
+
+def legacy(frames):
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    start = time.perf_counter()
+    for frame, offset in frames:
+        screen.blit(pygame.transform.scale(frame, screen.get_size()), offset)
+        pygame.display.update()
+    return (time.perf_counter() - start) / len(frames)
+
+def present(mode, frames, overlay):
+    #a fresh display for each mode, SDL cannot switch an open window to SCALED
+    pygame.display.quit()
+    pygame.display.init()
+    presenter = Presenter(mode, FRAME_SIZE, WINDOW_SIZE)
+    start = time.perf_counter()
+    for frame, offset in frames:
+        presenter.present(frame, offset)
+        presenter.overlay(overlay, (20, 20))
+        presenter.update()
+    return (time.perf_counter() - start) / len(frames), presenter
+
+def main():
+    pygame.init()
+    frames = record()
+    overlay = pygame.font.Font('Assets/font.ttf', 20).render('AI: ON (TAB to toggle)', True, 'white')
+    shaking = sum(1 for frame, offset in frames if offset[0] or offset[1])
+
+    print(f'{FRAMES} frames of an AI session on level 0 ({shaking} shaking), {FRAME_SIZE[0]}x{FRAME_SIZE[1]} to a {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]} window, {os.environ.get("SDL_VIDEODRIVER", "default")} video driver')
+    old = legacy(frames)
+    print(f'{"scale (old)":<14}{old * 1000:8.3f}ms per frame')
+    windows = {}
+    for mode in PRESENT_MODES:
+        new, presenter = present(mode, frames, overlay)
+        windows[mode] = pygame.image.tobytes(presenter.window, 'RGB')
+        print(f'{mode:<14}{new * 1000:8.3f}ms per frame ({old / new:.2f}x)')
+
+    #dirty only redraws what changed, so it has to end up with exactly the picture integer draws in full
+    assert windows['dirty'] == windows['integer'], 'dirty mode drifted from integer mode'
+
+if __name__ == '__main__':
+    main()
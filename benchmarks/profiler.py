@@ -0,0 +1,91 @@
+#measures what the frame profiler costs: a section entered while the profiler is off and on, end_frame, how many sections a frame enters
+#and what that adds up to against an AI session's step + render_frame time, which is also timed with the profiler off and on
+#(that difference is within the run to run noise, the per section numbers are the reliable ones), run from the repo root: python benchmarks/profiler.py
+import os
+import random
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from Hpgame import Game
+from scripts.profiler import Profiler, Section
+
+FRAMES = 1200
+ENTRIES = 1000000
+RUNS = 5
+
+def section_cost(enabled):
+    profiler = Profiler(enabled=enabled)
+    section = profiler.section
+    empty = timeit.timeit('pass', number=ENTRIES)
+    timed = timeit.timeit('with section("x"):\n    pass', globals={'section': section}, number=ENTRIES)
+    return (timed - empty) / ENTRIES
+
+def end_frame_cost(sections):
+    profiler = Profiler(enabled=True)
+    for i in range(sections):
+        with profiler.section(str(i)):
+            pass
+    return timeit.timeit(profiler.end_frame, number=ENTRIES // 10) / (ENTRIES // 10)
+
+def sections_per_frame():
+    #sections entered in one frame of the session, counted through Section.__enter__, and how many different ones
+    entered = 0
+    enter = Section.__enter__
+    def counting_enter(self):
+        nonlocal entered
+        entered += 1
+        return enter(self)
+    Section.__enter__ = counting_enter
+    try:
+        game = session(True)
+        for frame in range(FRAMES // 4):
+            frame_step(game)
+    finally:
+        Section.__enter__ = enter
+    return entered / (FRAMES // 4), len(game.profiler.names)
+
+def session(enabled):
+    random.seed(0)
+    game = Game(headless=True, profile=enabled)
+    game.start_gameplay(0, 0)
+    game.ai_player.generate_bug_report = lambda *args, **kwargs: None
+    return game
+
+def frame_step(game):
+    game.step()
+    game.render_frame()
+    game.profiler.end_frame()
+
+def frame_time(enabled):
+    game = session(enabled)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        frame_step(game)
+    return (time.perf_counter() - start) / FRAMES
+
+def main():
+    #alternated, so drift in the machine's speed hits both the same
+    times = {False: [], True: []}
+    for run in range(RUNS):
+        for enabled in (False, True):
+            times[enabled].append(frame_time(enabled))
+    off_frame = min(times[False])
+    on_frame = min(times[True])
+
+    off = section_cost(False)
+    on = section_cost(True)
+    entered, sections = sections_per_frame()
+    end_frame = end_frame_cost(sections)
+    print(f'{FRAMES} frames of an AI session, step + render_frame, {entered:.1f} sections entered per frame ({sections} different ones)')
+    print(f'{"":<16}{"per section":>14}{"per frame":>14}{"of the frame":>14}{"frame, timed":>16}')
+    print(f'{"profiler off":<16}{off * 1e9:12.0f}ns{entered * off * 1e6:12.2f}us{entered * off / off_frame * 100:13.2f}%{off_frame * 1000:14.3f}ms')
+    on_total = entered * on + end_frame
+    print(f'{"profiler on":<16}{on * 1e9:12.0f}ns{on_total * 1e6:12.2f}us{on_total / off_frame * 100:13.2f}%{on_frame * 1000:14.3f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#measures projectile updates per second with the old list-of-lists projectiles against the ProjectilePool, with hundreds to thousands of bullets in the air, run from the repo root: python benchmarks/projectiles.py
+import os
+import random
+import sys
+import time
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scripts.tilemap import Tilemap
+from scripts.projectile import ProjectilePool, PROJECTILE_SPEED, PROJECTILE_LIFETIME
+
+MAP_PATH = 'Assets/maps/1.json'
+COUNTS = [100, 1000, 5000]
+FRAMES = 200
+
+def legacy_update(projectiles, tilemap, player_rect):
+    # [[x, y], direction, timer], as the game loop used to do it
+    wall_hits = []
+    player_hits = 0
+    for projectile in projectiles.copy():
+        projectile[0][0] += projectile[1]
+        projectile[2] += 1
+        if tilemap.solid_check(projectile[0]):
+            projectiles.remove(projectile)
+            wall_hits.append(projectile)
+        elif projectile[2] > PROJECTILE_LIFETIME:
+            projectiles.remove(projectile)
+        elif player_rect.collidepoint(projectile[0]):
+            projectiles.remove(projectile)
+            player_hits += 1
+    return wall_hits, player_hits
+
+def random_bullets(tilemap, count):
+    xs = [loc[0] for loc in tilemap.grid]
+    ys = [loc[1] for loc in tilemap.grid]
+    bullets = []
+    while len(bullets) < count:
+        pos = (random.uniform(min(xs), max(xs) + 1) * tilemap.tile_size, random.uniform(min(ys), max(ys) + 1) * tilemap.tile_size)
+        if not tilemap.solid_check(pos):
+            bullets.append((pos, random.choice([-PROJECTILE_SPEED, PROJECTILE_SPEED]), random.randrange(PROJECTILE_LIFETIME)))
+    return bullets
+
+def run(update, make, refill, bullets):
+    #keeps the population constant by respawning whatever was removed
+    projectiles = make(bullets)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        update(projectiles)
+        refill(projectiles, bullets)
+    return FRAMES * len(bullets) / (time.perf_counter() - start)
+
+def make_legacy(bullets):
+    return [[list(pos), velocity, age] for pos, velocity, age in bullets]
+
+def refill_legacy(projectiles, bullets):
+    for pos, velocity, age in bullets[len(projectiles):]:
+        projectiles.append([list(pos), velocity, 0])
+
+def make_pool(bullets):
+    pool = ProjectilePool()
+    for pos, velocity, age in bullets:
+        pool.spawn(pos, velocity)
+        pool.age[len(pool) - 1] = age
+    return pool
+
+def refill_pool(pool, bullets):
+    for pos, velocity, age in bullets[len(pool):]:
+        pool.spawn(pos, velocity)
+
+def main():
+    tilemap = Tilemap(None, tile_size=16)
+    tilemap.load(MAP_PATH)
+    player_rect = pygame.Rect(300, 100, 8, 17)
+    random.seed(0)
+
+    #same bullets, same survivors
+    bullets = random_bullets(tilemap, 1000)
+    legacy = make_legacy(bullets)
+    pool = make_pool(bullets)
+    for frame in range(PROJECTILE_LIFETIME + 1):
+        old_walls, old_hits = legacy_update(legacy, tilemap, player_rect)
+        new_walls, new_hits = pool.update(tilemap, player_rect)
+        assert len(old_walls) == len(new_walls) and old_hits == new_hits
+        assert sorted((p[0][0], p[0][1], p[1], p[2]) for p in legacy) == sorted(zip(pool.x[:len(pool)], pool.y, pool.velocity, pool.age))
+
+    print(f'{MAP_PATH}: {FRAMES} frames, bullets respawned as they are removed')
+    print(f'{"bullets":<10}{"list of lists":>18}{"pool":>18}{"speedup":>10}')
+    for count in COUNTS:
+        bullets = random_bullets(tilemap, count)
+        old = run(lambda p: legacy_update(p, tilemap, player_rect), make_legacy, refill_legacy, bullets)
+        new = run(lambda p: p.update(tilemap, player_rect), make_pool, refill_pool, bullets)
+        print(f'{count:<10}{old:>16,.0f}/s{new:>16,.0f}/s{new / old:>9.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#measures spark update + render time per frame with the old polygon-per-spark Spark against the cached-sprite SparkSystem, run from the repo root: python benchmarks/sparks.py
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scripts.spark import SparkSystem
+
+FRAMES = 300
+BURSTS = [1, 5, 10] #30 spark bursts (one hit) spawned per frame
+SHOTS = 2 #4 spark muzzle flashes per frame
+
+class LegacySpark:
+    #the old Spark
+    def __init__(self, pos, angle, speed):
+        self.pos = list(pos)
+        self.angle = angle
+        self.speed = speed
+
+    def update(self):
+        self.pos[0] += math.cos(self.angle) * self.speed
+        self.pos[1] += math.sin(self.angle) * self.speed
+        self.speed = max(0, self.speed - 0.1)
+        return not self.speed
+
+    def render(self, surf, offset=(0, 0)):
+        render_points = [
+            (self.pos[0] + math.cos(self.angle) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle) * self.speed * 3 - offset[1]),
+            (self.pos[0] + math.cos(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[1]),
+            (self.pos[0] + math.cos(self.angle + math.pi) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle + math.pi) * self.speed * 3 - offset[1]),
+            (self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[1]),
+        ]
+        pygame.draw.polygon(surf, (255, 255, 255), render_points)
+
+def spawns(bursts):
+    #the same random spawns for both versions: (pos, angle, speed)
+    frames = []
+    for frame in range(FRAMES):
+        spawned = []
+        for shot in range(SHOTS):
+            pos = (random.uniform(0, 320), random.uniform(0, 240))
+            spawned += [(pos, random.random() - 0.5 + math.pi, 2 + random.random()) for i in range(4)]
+        for burst in range(bursts):
+            pos = (random.uniform(0, 320), random.uniform(0, 240))
+            spawned += [(pos, random.random() * math.pi * 2, 2 + random.random()) for i in range(30)]
+        frames.append(spawned)
+    return frames
+
+def run_legacy(surf, frames):
+    sparks = []
+    times = []
+    for spawned in frames:
+        start = time.perf_counter()
+        for pos, angle, speed in spawned:
+            sparks.append(LegacySpark(pos, angle, speed))
+        for spark in sparks.copy():
+            if spark.update():
+                sparks.remove(spark)
+        for spark in sparks:
+            spark.render(surf)
+        times.append(time.perf_counter() - start)
+    return times, sparks
+
+def run_system(surf, frames):
+    sparks = SparkSystem()
+    times = []
+    for spawned in frames:
+        start = time.perf_counter()
+        for pos, angle, speed in spawned:
+            sparks.spawn(pos, angle, speed)
+        sparks.update()
+        sparks.render(surf)
+        times.append(time.perf_counter() - start)
+    return times, sparks
+
+def lit_pixels(surf):
+    return pygame.mask.from_surface(surf).count()
+
+def main():
+    pygame.display.set_mode((1, 1))
+    random.seed(0)
+
+    #same sparks alive in the same places, and about the same pixels lit on one frame
+    frames = spawns(1)
+    old_surf = pygame.Surface((320, 240), pygame.SRCALPHA)
+    new_surf = pygame.Surface((320, 240), pygame.SRCALPHA)
+    old_times, old_sparks = run_legacy(pygame.Surface((320, 240), pygame.SRCALPHA), frames)
+    new_times, new_sparks = run_system(pygame.Surface((320, 240), pygame.SRCALPHA), frames)
+    old_state = sorted((round(spark.pos[0], 6), round(spark.pos[1], 6)) for spark in old_sparks)
+    new_state = sorted((round(x, 6), round(y, 6)) for x, y in zip(new_sparks.x[:new_sparks.count], new_sparks.y))
+    assert old_state == new_state
+    for spark in old_sparks:
+        spark.render(old_surf)
+    new_sparks.render(new_surf)
+    overlap = pygame.mask.from_surface(old_surf).overlap_area(pygame.mask.from_surface(new_surf), (0, 0))
+    print(f'one frame, {len(old_sparks)} sparks: {lit_pixels(old_surf)} pixels lit by polygons, {lit_pixels(new_surf)} by sprites, {overlap} shared, {len(new_sparks.sprites)} sprites cached')
+
+    print(f'{FRAMES} frames, {SHOTS} muzzle flashes per frame plus 30 spark bursts')
+    print(f'{"bursts":<8}{"live":>8}{"polygons avg/max":>22}{"sprites avg/max":>22}{"speedup":>10}')
+    for bursts in BURSTS:
+        frames = spawns(bursts)
+        old_times, old_sparks = run_legacy(pygame.Surface((320, 240), pygame.SRCALPHA), frames)
+        new_times, new_sparks = run_system(pygame.Surface((320, 240), pygame.SRCALPHA), frames)
+        old_avg = sum(old_times) / len(old_times)
+        new_avg = sum(new_times) / len(new_times)
+        print(f'{bursts:<8}{len(new_sparks):>8}{old_avg * 1000:>12.3f}/{max(old_times) * 1000:.3f}ms{new_avg * 1000:>12.3f}/{max(new_times) * 1000:.3f}ms{old_avg / new_avg:>9.2f}x')
+
+if __name__ == '__main__':
+    main()
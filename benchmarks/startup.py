@@ -0,0 +1,87 @@
+#measures startup in fresh processes: image loading the old way (load_images one png at a time), cold (no bundle, pngs decoded, in a thread pool on multi-core machines, and the bundle written)
+#and warm (read from the bundle), plus the whole Game() construction with every asset loaded up front (like the old asset dict) against the lazy registry,
+#and the image memory a headless session holds once it is playing, run from the repo root: python benchmarks/startup.py
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+RUNS = 7
+BENCH_BUNDLE = 'Assets/.cache/startup_benchmark.bundle' #its own bundle, so the game's cache is left alone
+
+CHILD = '''
+import os, sys, time
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+sys.path.insert(0, '.')
+import pygame
+pygame.display.set_mode((1, 1))
+mode = sys.argv[1]
+start = time.perf_counter()
+if mode == 'sequential':
+    from scripts.utils import load_images, load_image
+    from scripts.assets import AssetPipeline
+    pipeline = AssetPipeline()
+    for folder, names in pipeline.sources().items():
+        if folder:
+            load_images(folder)
+        else:
+            for name in names:
+                load_image(name)
+elif mode in ('game', 'game eager'):
+    import scripts.assets
+    scripts.assets.BUNDLE_PATH = sys.argv[2]
+    import Hpgame
+    game = Hpgame.Game(headless=True)
+    if mode == 'game eager':
+        for name in game.assets:
+            game.assets[name]
+    elapsed = time.perf_counter() - start
+    game.start_gameplay(0, 0)
+    for i in range(600):
+        game.step()
+    pipeline = game.assets.pipeline
+    print(sum(surf.get_bytesize() * surf.get_width() * surf.get_height() for surf in list(pipeline.atlases.values()) + list(pipeline.images.values())))
+    print(elapsed)
+    sys.exit()
+else:
+    from scripts.assets import AssetPipeline
+    pipeline = AssetPipeline(bundle_path=sys.argv[2]).load().load_all()
+    assert pipeline.loaded_from == ('pngs' if mode == 'cold' else 'bundle')
+print(time.perf_counter() - start)
+'''
+
+def run(mode, cold=False, held=None):
+    #held collects the image bytes the game modes report
+    times = []
+    for i in range(RUNS):
+        if cold and os.path.exists(BENCH_BUNDLE):
+            os.remove(BENCH_BUNDLE)
+        output = subprocess.run([sys.executable, '-c', CHILD, mode, BENCH_BUNDLE], capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[-1]))
+        if held is not None:
+            held.append(int(output[-2]))
+    return statistics.median(times)
+
+def main():
+    print(f'median of {RUNS} fresh processes')
+    sequential = run('sequential')
+    print(f'{"images, load_images":<28}{sequential * 1000:8.1f}ms')
+    cold = run('cold', cold=True)
+    print(f'{"images, cold (+ bundle)":<28}{cold * 1000:8.1f}ms ({sequential / cold:.2f}x)')
+    warm = run('warm')
+    print(f'{"images, warm (bundle)":<28}{warm * 1000:8.1f}ms ({sequential / warm:.2f}x)')
+    game_cold = run('game', cold=True)
+    print(f'{"Game(), cold":<28}{game_cold * 1000:8.1f}ms')
+    for mode in ('game eager', 'game'):
+        held = []
+        game_warm = run(mode, held=held)
+        print(f'{"Game(), warm, " + ("eager" if mode == "game eager" else "lazy"):<28}{game_warm * 1000:8.1f}ms, {max(held) / 1024:.0f}KiB of images held after 600 headless frames')
+    os.remove(BENCH_BUNDLE)
+
+if __name__ == '__main__':
+    main()
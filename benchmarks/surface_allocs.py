@@ -0,0 +1,84 @@
+#counts the Surfaces the game allocates per rendered frame, by where they come from, with the entity sprites flipped every render (before) against the pre-flipped animation frames (after),
+#run from the repo root: python benchmarks/surface_allocs.py
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+from Hpgame import Game
+from scripts.Entities import PhysicsEntity, Enemy
+
+FRAMES = 600
+COUNTS = Counter()
+
+def counted(name, func, dest_arg=None):
+    #dest_arg: position of the optional destination surface, calls drawing into one do not allocate
+    def wrapper(*args, **kwargs):
+        if dest_arg is None or (len(args) <= dest_arg and 'dest_surface' not in kwargs):
+            COUNTS[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+class CountingSurface(pygame.Surface):
+    def __init__(self, *args, **kwargs):
+        COUNTS['Surface()'] += 1
+        super().__init__(*args, **kwargs)
+
+class CountingFont(pygame.font.Font):
+    def render(self, *args, **kwargs):
+        COUNTS['Font.render'] += 1
+        return super().render(*args, **kwargs)
+
+def legacy_entity_render(self, surf, offset=(0, 0)):
+    surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
+
+def legacy_enemy_render(self, surf, offset=(0, 0)):
+    PhysicsEntity.render(self, surf, offset=offset)
+    if self.flip:
+        surf.blit(pygame.transform.flip(self.game.assets['gun'], True, False), (self.rect().centerx - 4 - self.game.assets['gun'].get_width() - offset[0], self.rect().centery - offset[1]))
+    else:
+        surf.blit(self.game.assets['gun'], (self.rect().centerx + 4 - offset[0], self.rect().centery - offset[1]))
+
+def session(label):
+    #the same AI session (same seed) rendering every frame, counting only what the frames allocate
+    random.seed(0)
+    game = Game(headless=True)
+    game.start_gameplay(0, 0)
+    game.ai_player.generate_bug_report = lambda *args, **kwargs: None
+    pygame.transform.flip = counted('transform.flip', FLIP)
+    pygame.transform.scale = counted('transform.scale', SCALE, dest_arg=2)
+    pygame.Surface = CountingSurface
+    pygame.font.Font = CountingFont
+    COUNTS.clear()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        game.step()
+        game.render_frame()
+    elapsed = time.perf_counter() - start
+    counts = dict(COUNTS)
+    pygame.transform.flip, pygame.transform.scale, pygame.Surface, pygame.font.Font = FLIP, SCALE, SURFACE, FONT
+    print(f'{label:<8}{sum(counts.values()) / FRAMES:>10.1f}{elapsed / FRAMES * 1000:>10.3f}ms  ' + ', '.join(f'{name} {count / FRAMES:.1f}' for name, count in sorted(counts.items())))
+
+FLIP = pygame.transform.flip
+SCALE = pygame.transform.scale
+SURFACE = pygame.Surface
+FONT = pygame.font.Font
+
+def main():
+    print(f'{FRAMES} frames of an AI session on level 0, Surfaces allocated per frame (mask.to_surface is not counted)')
+    print(f'{"":<8}{"allocs":>10}{"frame":>12}')
+    entity_render, enemy_render = PhysicsEntity.render, Enemy.render
+    PhysicsEntity.render, Enemy.render = legacy_entity_render, legacy_enemy_render
+    session('before')
+    PhysicsEntity.render, Enemy.render = entity_render, enemy_render
+    session('after')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#measures tilemap lookups per second (solid_check, tiles_around, physics_rects_around, solid_check_many) on the largest map, run from the repo root: python benchmarks/tilemap_lookups.py
+import os
+import random
+import sys
+import time
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scripts.tilemap import Tilemap, PHYSICS_TILES, NEIGHBOUR_OFFSETS
+
+MAP_PATH = 'Assets/maps/1.json'
+SAMPLES = 200000
+
+def legacy_solid_check(tilemap, pos):
+    tile_loc = str(int(pos[0] // tilemap.tile_size)) + ';' + str(int(pos[1] // tilemap.tile_size))
+    if tile_loc in tilemap.tilemap:
+        if tilemap.tilemap[tile_loc]['type'] in PHYSICS_TILES:
+            return tilemap.tilemap[tile_loc]
+
+def legacy_tiles_around(tilemap, pos):
+    tiles = []
+    tile_loc = (int(pos[0] // tilemap.tile_size), int(pos[1] // tilemap.tile_size))
+    for offset in NEIGHBOUR_OFFSETS:
+        check_loc = str(tile_loc[0] + offset[0]) + ';' + str(tile_loc[1] + offset[1])
+        if check_loc in tilemap.tilemap:
+            tiles.append(tilemap.tilemap[check_loc])
+    return tiles
+
+def legacy_physics_rects_around(tilemap, pos):
+    rects = []
+    for tile in legacy_tiles_around(tilemap, pos):
+        if tile['type'] in PHYSICS_TILES:
+            rects.append(pygame.Rect(tile['pos'][0] * tilemap.tile_size, tile['pos'][1] * tilemap.tile_size, tilemap.tile_size, tilemap.tile_size))
+    return rects
+
+def rate(func, points):
+    start = time.perf_counter()
+    for point in points:
+        func(point)
+    return len(points) / (time.perf_counter() - start)
+
+def main():
+    tilemap = Tilemap(None, tile_size=16)
+    tilemap.load(MAP_PATH)
+
+    xs = [loc[0] for loc in tilemap.grid]
+    ys = [loc[1] for loc in tilemap.grid]
+    random.seed(0)
+    points = [(random.uniform(min(xs), max(xs) + 1) * tilemap.tile_size, random.uniform(min(ys), max(ys) + 1) * tilemap.tile_size) for i in range(SAMPLES)]
+
+    for point in points[:1000]:
+        assert bool(legacy_solid_check(tilemap, point)) == bool(tilemap.solid_check(point))
+        assert legacy_tiles_around(tilemap, point) == tilemap.tiles_around(point)
+        assert legacy_physics_rects_around(tilemap, point) == list(tilemap.physics_rects_around(point))
+
+    print(f'{MAP_PATH}: {len(tilemap.grid)} tiles, {SAMPLES} random points')
+    print(f'{"query":<16}{"string keys":>16}{"grid":>16}{"speedup":>10}')
+    for name, legacy, current in [
+        ('solid_check', lambda p: legacy_solid_check(tilemap, p), lambda p: tilemap.solid_check(p)),
+        ('tiles_around', lambda p: legacy_tiles_around(tilemap, p), lambda p: tilemap.tiles_around(p)),
+        ('physics_rects', lambda p: legacy_physics_rects_around(tilemap, p), lambda p: tilemap.physics_rects_around(p)),
+    ]:
+        old = rate(legacy, points)
+        new = rate(current, points)
+        print(f'{name:<16}{old:>14,.0f}/s{new:>14,.0f}/s{new / old:>9.2f}x')
+
+    #the batched probe answers every point in one call
+    assert tilemap.solid_check_many(points[:1000]) == [bool(legacy_solid_check(tilemap, point)) for point in points[:1000]]
+    old = rate(lambda p: legacy_solid_check(tilemap, p), points)
+    start = time.perf_counter()
+    tilemap.solid_check_many(points)
+    new = len(points) / (time.perf_counter() - start)
+    print(f'{"solid_many":<16}{old:>14,.0f}/s{new:>14,.0f}/s{new / old:>9.2f}x')
+
+if __name__ == '__main__':
+    main()
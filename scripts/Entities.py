@@ -2,8 +2,7 @@ import math
 import random
 import pygame
 
-from scripts.particle import Particle
-from scripts.spark import Spark
+from scripts.projectile import PROJECTILE_SPEED
 
 class PhysicsEntity:
     def __init__(self, game, e_type, pos, size):
@@ -79,7 +78,7 @@ class PhysicsEntity:
         self.animation.update()
 
     def render(self, surf, offset=(0, 0)):
-        surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
+        surf.blit(self.animation.img(self.flip), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
 
 class Enemy(PhysicsEntity):
     def __init__(self, game, pos, size):
@@ -102,14 +101,16 @@ class Enemy(PhysicsEntity):
                 if (abs(dis[1]) < 16):
                     if (self.flip and dis[0] < 0):
                         self.game.sfx['shoot'].play()
-                        self.game.projectiles.append([[self.rect().centerx - 7, self.rect().centery], -1.5, 0])
+                        muzzle = (self.rect().centerx - 7, self.rect().centery)
+                        self.game.projectiles.spawn(muzzle, -PROJECTILE_SPEED)
                         for i in range(4):
-                            self.game.sparks.append(Spark(self.game.projectiles[-1][0], random.random() - 0.5 + math.pi, 2 + random.random()))
+                            self.game.sparks.spawn(muzzle, random.random() - 0.5 + math.pi, 2 + random.random())
                     if (not self.flip and dis[0] > 0):
                         self.game.sfx['shoot'].play()
-                        self.game.projectiles.append([[self.rect().centerx + 7, self.rect().centery], 1.5, 0])
+                        muzzle = (self.rect().centerx + 7, self.rect().centery)
+                        self.game.projectiles.spawn(muzzle, PROJECTILE_SPEED)
                         for i in range(4):
-                            self.game.sparks.append(Spark(self.game.projectiles[-1][0], random.random() - 0.5, 2 + random.random()))
+                            self.game.sparks.spawn(muzzle, random.random() - 0.5, 2 + random.random())
         elif random.random() < 0.01:
             self.walking = random.randint(30, 120)
         
@@ -127,17 +128,17 @@ class Enemy(PhysicsEntity):
                 for i in range(30):
                     angle = random.random() * math.pi * 2
                     speed = random.random() * 5
-                    self.game.sparks.append(Spark(self.rect().center, angle, 2 + random.random()))
-                    self.game.particles.append(Particle(self.game, 'particle', self.rect().center, velocity=[math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], frame=random.randint(0, 7)))
-                self.game.sparks.append(Spark(self.rect().center, 0, 5 + random.random()))
-                self.game.sparks.append(Spark(self.rect().center, math.pi, 5 + random.random()))
+                    self.game.sparks.spawn(self.rect().center, angle, 2 + random.random())
+                    self.game.particles.spawn('particle', self.rect().center, velocity=(math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5), frame=random.randint(0, 7))
+                self.game.sparks.spawn(self.rect().center, 0, 5 + random.random())
+                self.game.sparks.spawn(self.rect().center, math.pi, 5 + random.random())
                 return True
         
     def render(self, surf, offset=(0, 0)):
         super().render(surf, offset=offset)
         
         if self.flip:
-            surf.blit(pygame.transform.flip(self.game.assets['gun'], True, False), (self.rect().centerx - 4 - self.game.assets['gun'].get_width() - offset[0], self.rect().centery - offset[1]))
+            surf.blit(self.game.assets['gun/flipped'], (self.rect().centerx - 4 - self.game.assets['gun'].get_width() - offset[0], self.rect().centery - offset[1]))
         else:
             surf.blit(self.game.assets['gun'], (self.rect().centerx + 4 - offset[0], self.rect().centery - offset[1]))
 
@@ -190,7 +191,7 @@ class Player(PhysicsEntity):
                 angle = random.random() * math.pi * 2
                 speed = random.random() * 0.5 + 0.5
                 pvelocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-                self.game.particles.append(Particle(self.game, 'particle', self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)))
+                self.game.particles.spawn('particle', self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))
         if self.dashing > 0:
             self.dashing = max(0, self.dashing - 1)
         if self.dashing < 0:
@@ -209,7 +210,7 @@ class Player(PhysicsEntity):
                 else:
                     self.velocity[0] *= 0.1
             pvelocity = [abs(self.dashing) / self.dashing * random.random() * 3, 0]
-            self.game.particles.append(Particle(self.game, 'particle', self.rect().center, velocity=pvelocity, frame=random.randint(0, 7)))
+            self.game.particles.spawn('particle', self.rect().center, velocity=pvelocity, frame=random.randint(0, 7))
                 
         if self.velocity[0] > 0:
             self.velocity[0] = max(self.velocity[0] - 0.1, 0)
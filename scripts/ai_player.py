@@ -1,7 +1,7 @@
 import math
-import pygame
 import os
 import time
+from scripts.navigation import Navigator, JUMP_RISE, JUMP_SPAN, DASH_SPAN
 
 class AIPlayer:
     def __init__(self, game):
@@ -9,7 +9,14 @@ class AIPlayer:
         self.reaction_time = 10  # frames to wait before reacting to threats
         self.threat_memory = []  # remember projectile positions
         self.last_action_time = 0
-        self.path = []  # for pathfinding
+        self.path = []  # planned navigation edges towards the target's platform
+        self.navigator = Navigator(game)
+        self.path_start = None  # segment the current plan leaves from
+        self.path_goal = None  # segment the current plan leads to
+        self.path_enemy = None
+        self.path_launched = None  # edge we left the ground for
+        self.path_jumps = 0  # jumps/dashes spent on the current edge
+        self.path_dashes = 0
         self.target_enemy = None
         self.safe_platform = None
         self.last_pos = None
@@ -80,7 +87,7 @@ class AIPlayer:
         }
 
     def get_nearest_enemy(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         
         # Keep current target if lock time hasn't expired and target still exists
         if (self.current_target and 
@@ -140,18 +147,16 @@ class AIPlayer:
         
         return nearest, min_score
 
-    def is_position_safe(self, pos):
+    def is_position_safe(self, pos, ground_checked=False):
         # Check if position has ground below
-        ground_check = self.game.tilemap.solid_check((pos[0], pos[1] + 32))
-        if not ground_check:
-            return False
+        if not ground_checked:
+            ground_check = self.game.tilemap.solid_check((pos[0], pos[1] + 32))
+            if not ground_check:
+                return False
             
         # Check for projectiles near position
-        for proj in self.game.projectiles:
-            proj_pos = proj[0]
-            dist = math.sqrt((pos[0] - proj_pos[0])**2 + (pos[1] - proj_pos[1])**2)
-            if dist < 40:  # danger zone
-                return False
+        if self.game.projectiles.any_within(pos, 40):  # danger zone
+            return False
                 
         return True
 
@@ -159,11 +164,13 @@ class AIPlayer:
         player_pos = self.game.player.rect().center
         search_radius = 100
         
-        # Sample points in a grid pattern
-        for x in range(player_pos[0] - search_radius, player_pos[0] + search_radius, 32):
-            for y in range(player_pos[1] - search_radius, player_pos[1] + search_radius, 32):
-                if self.is_position_safe((x, y)):
-                    return (x, y)
+        # Sample points in a grid pattern, probing the ground below all of them in one batch
+        points = [(x, y) for x in range(player_pos[0] - search_radius, player_pos[0] + search_radius, 32)
+                  for y in range(player_pos[1] - search_radius, player_pos[1] + search_radius, 32)]
+        grounded = self.game.tilemap.solid_check_many([(x, y + 32) for x, y in points])
+        for point, has_ground in zip(points, grounded):
+            if has_ground and self.is_position_safe(point, ground_checked=True):
+                return point
                     
         return None
 
@@ -175,8 +182,8 @@ class AIPlayer:
         all_projectiles = []
         
         # Add enemy projectiles
-        for proj in self.game.projectiles:
-            all_projectiles.append((proj[0], proj[1], "enemy"))
+        for proj_pos, proj_dir in self.game.projectiles:
+            all_projectiles.append((proj_pos, proj_dir, "enemy"))
             
         # Add player projectiles if they exist
         if hasattr(self.game, 'player_projectiles'):
@@ -222,16 +229,15 @@ class AIPlayer:
         check_height = 64  # Check up to 64 pixels above
         check_width = 32   # Check 32 pixels wide
         
-        # Check for platform above
-        for y_offset in range(16, check_height, 16):
-            left_point = (player.pos[0] - check_width // 2, player.pos[1] - y_offset)
-            right_point = (player.pos[0] + check_width // 2, player.pos[1] - y_offset)
-            
-            if (self.game.tilemap.solid_check(left_point) or 
-                self.game.tilemap.solid_check(right_point)):
-                if self.debug:
-                    print(f"Found platform {y_offset}px above")
-                return True, y_offset
+        # Check for platform above, casting a ray up each side and taking the nearer hit
+        offsets = range(16, check_height, 16)
+        hits = [self.game.tilemap.first_solid((player.pos[0] + side, player.pos[1] - offsets[0]), (0, -offsets.step), len(offsets)) for side in (-(check_width // 2), check_width // 2)]
+        hits = [i for i in hits if i is not None]
+        if hits:
+            y_offset = offsets[min(hits)]
+            if self.debug:
+                print(f"Found platform {y_offset}px above")
+            return True, y_offset
         return False, 0
 
     def is_near_edge(self):
@@ -243,13 +249,16 @@ class AIPlayer:
         left_edge = False
         right_edge = False
         
+        left_ground, right_ground = self.game.tilemap.solid_check_many([
+            (player.pos[0] - check_distance, player.pos[1] + check_depth),
+            (player.pos[0] + check_distance, player.pos[1] + check_depth),
+        ])
+
         # Check left edge
-        left_ground = self.game.tilemap.solid_check((player.pos[0] - check_distance, player.pos[1] + check_depth))
         if not left_ground and player.collisions['down']:
             left_edge = True
             
         # Check right edge
-        right_ground = self.game.tilemap.solid_check((player.pos[0] + check_distance, player.pos[1] + check_depth))
         if not right_ground and player.collisions['down']:
             right_edge = True
             
@@ -265,23 +274,22 @@ class AIPlayer:
         check_depth = 128  # Check up to 128 pixels below
         check_width = 32   # Check 32 pixels wide
         
-        # Check for platform below
-        for y_offset in range(32, check_depth, 16):
-            left_point = (player.pos[0] - check_width // 2, player.pos[1] + y_offset)
-            right_point = (player.pos[0] + check_width // 2, player.pos[1] + y_offset)
-            
-            if (self.game.tilemap.solid_check(left_point) or 
-                self.game.tilemap.solid_check(right_point)):
-                if self.debug:
-                    print(f"Found platform {y_offset}px below")
-                return True, y_offset
+        # Check for platform below, casting a ray down each side and taking the nearer hit
+        offsets = range(32, check_depth, 16)
+        hits = [self.game.tilemap.first_solid((player.pos[0] + side, player.pos[1] + offsets[0]), (0, offsets.step), len(offsets)) for side in (-(check_width // 2), check_width // 2)]
+        hits = [i for i in hits if i is not None]
+        if hits:
+            y_offset = offsets[min(hits)]
+            if self.debug:
+                print(f"Found platform {y_offset}px below")
+            return True, y_offset
         if self.debug:
             print("No platform detected below!")
         return False, 0
 
     def detect_immortal_fall_bug(self):
         player = self.game.player
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         current_y = player.pos[1]
 
         # Check for platform below player
@@ -289,12 +297,12 @@ class AIPlayer:
         check_depth = 200  # Check up to 200 pixels below
         player_pos = player.pos
         
-        # Scan for platforms below
-        for y_offset in range(32, check_depth, 16):
-            check_pos = (player_pos[0], player_pos[1] + y_offset)
-            if self.game.tilemap.solid_check(check_pos):
-                has_platform = True
-                break
+        # Look up the ground below in the tilemap's column table; it counts when one of
+        # the 16px samples from 32px down to check_depth would have landed in it
+        last_offset = range(32, check_depth, 16)[-1]
+        ground_distance = self.game.tilemap.ground_distance((player_pos[0], player_pos[1] + 32))
+        if ground_distance is not None and ground_distance <= last_offset - 32:
+            has_platform = True
 
         # Start tracking time if no platform is found
         if not has_platform and not player.collisions['down']:
@@ -356,7 +364,7 @@ class AIPlayer:
 
     def detect_attack_bug(self):
         player = self.game.player
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         
         # Check for enemies in attack range
         enemies_in_range = 0
@@ -394,36 +402,32 @@ class AIPlayer:
             self.attack_bug_reported = False
 
     def detect_bullet_survival_bug(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         
         # Check for bullet collisions
-        for proj in self.game.projectiles:
-            proj_rect = pygame.Rect(proj[0][0] - 4, proj[0][1] - 4, 8, 8)
-            player_rect = self.game.player.rect()
-            
-            if player_rect.colliderect(proj_rect):
-                # Only count hit if invulnerability period is over
-                if current_time - self.last_hit_time > self.hit_invulnerability_time:
-                    self.bullet_hits += 1
-                    self.last_hit_time = current_time
-                    
-                    if self.bullet_hits >= self.max_bullet_hits and not self.bullet_survival_reported:
-                        self.bullet_survival_reported = True
-                        self.bugs_detected['bullet_survival'] = {
-                            'active': True,
-                            'details': {
-                                'type': 'Bullet Hit Survival',
-                                'hits_taken': self.bullet_hits,
-                                'max_hits': self.max_bullet_hits,
-                                'time_window': f"{(current_time - self.last_hit_time)/1000:.1f}s"
-                            },
-                            'time': current_time
-                        }
-                        if self.debug:
-                            print(f"Bullet survival bug detected! Hits: {self.bullet_hits}")
+        if self.game.projectiles.colliding(self.game.player.rect()):
+            # Only count hit if invulnerability period is over
+            if current_time - self.last_hit_time > self.hit_invulnerability_time:
+                self.bullet_hits += 1
+                self.last_hit_time = current_time
+                
+                if self.bullet_hits >= self.max_bullet_hits and not self.bullet_survival_reported:
+                    self.bullet_survival_reported = True
+                    self.bugs_detected['bullet_survival'] = {
+                        'active': True,
+                        'details': {
+                            'type': 'Bullet Hit Survival',
+                            'hits_taken': self.bullet_hits,
+                            'max_hits': self.max_bullet_hits,
+                            'time_window': f"{(current_time - self.last_hit_time)/1000:.1f}s"
+                        },
+                        'time': current_time
+                    }
+                    if self.debug:
+                        print(f"Bullet survival bug detected! Hits: {self.bullet_hits}")
 
     def detect_decision_bug(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         
         # Track target switching
         if self.current_target != self.last_target:
@@ -448,7 +452,7 @@ class AIPlayer:
 
     def generate_bug_report(self):
         try:
-            timestamp = pygame.time.get_ticks()
+            timestamp = self.game.clock.get_ticks()
             
             # Create Logs directory
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -874,15 +878,17 @@ class AIPlayer:
         # Check for obstacle in movement direction
         check_x = player.pos[0] + (check_distance if moving_right else -check_distance)
         
+        # Probe ground level and every 8px step of the obstacle's height in one batch
+        heights = range(0, check_height, 8)
+        solids = self.game.tilemap.solid_check_many([(check_x, player.pos[1] + height) for height in heights])
+
         # First check at ground level
-        ground_pos = (check_x, player.pos[1])
-        if not self.game.tilemap.solid_check(ground_pos):
+        if not solids[0]:
             return False, 0  # No obstacle if there's nothing at ground level
         
         # If there's something at ground level, check its height
-        for height in range(0, check_height, 8):
-            check_pos = (check_x, player.pos[1] + height)
-            if not self.game.tilemap.solid_check(check_pos):
+        for height, solid in zip(heights, solids):
+            if not solid:
                 if height > 0:  # Only consider it an obstacle if it has height
                     if self.debug:
                         print(f"Obstacle detected at height: {height}px")
@@ -892,7 +898,7 @@ class AIPlayer:
         return True, check_height  # Full height obstacle
 
     def can_jump(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         player = self.game.player
         
         # Basic conditions for jumping
@@ -910,7 +916,7 @@ class AIPlayer:
         return cooldown_ok and attempts_ok
 
     def try_jump(self, reason=""):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         player = self.game.player
         
         if self.can_jump():
@@ -932,7 +938,7 @@ class AIPlayer:
         return False
 
     def try_periodic_jump(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         player = self.game.player
         
         # Check if it's time for periodic jump
@@ -957,25 +963,26 @@ class AIPlayer:
         start_y = player.pos[1]
         end_y = player.pos[1] + scan_range
         
-        # Scan area below player in a grid
-        for x in range(int(start_x), int(end_x), 16):  # 16-pixel steps for efficiency
-            for y in range(int(start_y), int(end_y), 16):
-                # Check if this position is a platform
-                if self.game.tilemap.solid_check((x, y)):
-                    # Check if there's empty space above this position (valid platform)
-                    if not self.game.tilemap.solid_check((x, y - 16)):
-                        # Calculate distance to this platform
-                        dist_x = x - player.pos[0]
-                        dist_y = y - player.pos[1]
-                        distance = math.sqrt(dist_x**2 + dist_y**2)
-                        
-                        # Update if this is the nearest platform
-                        if distance < min_distance:
-                            min_distance = distance
-                            best_platform = (x, y - 16)  # Store position above platform
-                            
-                            if self.debug:
-                                print(f"Found platform at ({x}, {y}) - Distance: {distance:.1f}px")
+        # Platform tops (solid tiles with empty space above) in the area below the player,
+        # taken from the tilemap's precomputed index instead of scanning it
+        tile_size = self.game.tilemap.tile_size
+        for tile_x, tile_y in self.game.tilemap.platform_tops_in((start_x, start_y, end_x - start_x, end_y - start_y)):
+            # Closest point on the top edge of the tile
+            x = min(max(player.pos[0], tile_x * tile_size), tile_x * tile_size + tile_size - 1)
+            y = tile_y * tile_size
+
+            # Calculate distance to this platform
+            dist_x = x - player.pos[0]
+            dist_y = y - player.pos[1]
+            distance = math.sqrt(dist_x**2 + dist_y**2)
+            
+            # Update if this is the nearest platform
+            if distance < min_distance:
+                min_distance = distance
+                best_platform = (x, y - 16)  # Store position above platform
+                
+                if self.debug:
+                    print(f"Found platform at ({x}, {y}) - Distance: {distance:.1f}px")
         
         return best_platform, min_distance
 
@@ -1008,7 +1015,7 @@ class AIPlayer:
         return False, None
 
     def try_double_jump(self, target_platform):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         player = self.game.player
         
         # Only double jump if we haven't recently jumped
@@ -1030,42 +1037,213 @@ class AIPlayer:
         
         return False
 
+    def get_reachable_enemy(self):
+        start = self.navigator.segment_under(self.game.player.rect())
+        if start is None:
+            # Airborne, keep going for the enemy we launched towards
+            if self.path and self.path_enemy in self.game.enemies:
+                return self.path_enemy, 0
+            return None, float('inf')
+
+        best = None
+        min_cost = float('inf')
+        for enemy in self.game.enemies:
+            goal = self.navigator.segment_under(enemy.rect())
+            if goal is None:
+                continue
+            path = self.navigator.find_path(start, goal)
+            if path is None:
+                continue
+            cost = sum(edge.cost for edge in path)
+            if cost < min_cost:
+                min_cost = cost
+                best = enemy
+        return best, min_cost
+
+    def follow_path(self, enemy):
+        # Steer along the planned path to the enemy's platform. Returns False when the enemy
+        # is on our own platform or can't be reached, leaving the direct chase to update()
+        player = self.game.player
+        player_rect = player.rect()
+        start = self.navigator.segment_under(player_rect)
+
+        # Standing on a segment is our grounded test, collisions['down'] only sets on the frames
+        # gravity has built up enough to push the player into the ground
+        if start is None:
+            if not self.path:
+                return False
+            self.steer_airborne(self.path[0])
+            return True
+
+        goal = self.navigator.segment_under(enemy.rect())
+        if goal is None and enemy is self.path_enemy:
+            goal = self.path_goal  # the enemy is in the air, keep the old goal
+        if goal is None or goal is start:
+            self.path = []
+            self.path_goal = None
+            return False
+
+        if self.path_launched:
+            if self.path_launched.source is start:
+                # Came back down where we started, the edge is out of reach
+                if self.debug:
+                    print(f"Path {self.path_launched.kind} failed, planning around it")
+                self.navigator.block_edge(self.path_launched)
+                self.path_goal = None
+            elif self.path and self.path[0] is self.path_launched and self.path_launched.target is start:
+                # Landed where the current edge leads
+                self.path.pop(0)
+                self.path_start = start
+            self.path_launched = None
+
+        # Only replan when the target's platform changes or we ended up off the plan
+        if goal is not self.path_goal or start is not self.path_start:
+            path = self.navigator.find_path(start, goal)
+            self.path = list(path) if path else []
+            self.path_start = start
+            self.path_goal = goal
+            self.path_enemy = enemy
+            if self.debug:
+                print(f"Planned path: {' -> '.join(edge.kind for edge in self.path) or 'unreachable'}")
+        if not self.path:
+            return False
+
+        edge = self.path[0]
+        self.path_jumps = 0
+        self.path_dashes = 0
+
+        # Walk to the launch point, then leave the platform towards the next one
+        offset = edge.launch_x - player_rect.centerx
+        if abs(offset) > 4:
+            self.game.movement[1 if offset > 0 else 0] = True
+            return True
+        self.game.movement[1 if edge.direction > 0 else 0] = True
+        if edge.kind != 'drop':
+            # Planned jumps skip try_jump's attempt budget, it is meant for flailing jumps
+            current_time = self.game.clock.get_ticks()
+            if current_time - self.last_jump_time > self.jump_cooldown and player.jump():
+                if self.debug:
+                    print(f"Jumping! Reason: Path {edge.kind}")
+                self.last_jump_time = current_time
+                self.path_jumps = 1
+                self.path_launched = edge
+            else:
+                self.game.movement = [False, False]  # wait at the launch point for the jump cooldown
+        return True
+
+    def steer_airborne(self, edge):
+        current_time = self.game.clock.get_ticks()
+        player = self.game.player
+        player_rect = player.rect()
+
+        if edge.kind == 'drop':
+            self.path_launched = edge
+
+        offset = edge.land_x - player_rect.centerx
+        if abs(offset) > 4:
+            self.game.movement[1 if offset > 0 else 0] = True
+
+        # Chain the edge's extra jumps once we start falling
+        if self.path_jumps and self.path_jumps < edge.jumps and player.velocity[1] > 0:
+            if player.jump():
+                self.path_jumps += 1
+                self.last_jump_time = current_time
+
+        # Dash across the part of the gap the jumps can't cover
+        if self.path_dashes < edge.dashes and not player.dashing and abs(offset) > DASH_SPAN * self.game.tilemap.tile_size:
+            player.flip = offset < 0
+            player.dash()
+            self.path_dashes += 1
+
+    def recover_airborne(self):
+        # Falling with no ground in reach: steer for the closest platform the remaining jumps can still make
+        current_time = self.game.clock.get_ticks()
+        player = self.game.player
+        player_rect = player.rect()
+        if player.velocity[1] <= 0:
+            return False
+        ground_distance = self.game.tilemap.ground_distance(player_rect.midbottom)
+        if ground_distance is not None and ground_distance <= self.platform_scan_range:
+            return False
+
+        tile_size = self.game.tilemap.tile_size
+        jumps = max(player.jumps, 1) if player.wall_slide else player.jumps  # wall jumps don't need a jump left
+        max_rise = jumps * JUMP_RISE * tile_size
+        max_reach = (jumps + 1) * JUMP_SPAN * tile_size
+        best = None
+        min_distance = float('inf')
+        for segment in self.navigator.current_graph().segments:
+            x = min(max(player_rect.centerx, segment.left * tile_size), (segment.right + 1) * tile_size - 1)
+            y = segment.row * tile_size
+            if player_rect.bottom - y > max_rise or abs(x - player_rect.centerx) > max_reach:
+                continue
+            distance = math.hypot(x - player_rect.centerx, y - player_rect.bottom)
+            if distance < min_distance:
+                min_distance = distance
+                best = (x, y)
+        if not best:
+            return False
+
+        if abs(best[0] - player_rect.centerx) > 4:
+            self.game.movement[1 if best[0] > player_rect.centerx else 0] = True
+        # Only jump once we've dropped below the platform's top, until then falling gets us there
+        if player_rect.bottom > best[1] and current_time - self.last_jump_time > self.jump_cooldown:
+            if player.jump():
+                self.last_jump_time = current_time
+                if self.debug:
+                    print(f"Recovery jump towards platform at {best}")
+        return True
+
     def update(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         player = self.game.player
+        profiler = self.game.profiler  # a section per detector and probe
         
         # Check for combat bugs (HIGH PRIORITY)
-        self.detect_attack_bug()
+        with profiler.section('ai/detect_attack_bug'):
+            self.detect_attack_bug()
         
         # Check for bullet survival bug (HIGH PRIORITY)
-        self.detect_bullet_survival_bug()
+        with profiler.section('ai/detect_bullet_survival_bug'):
+            self.detect_bullet_survival_bug()
         
         # Check for immortal fall bug (HIGHEST PRIORITY)
-        self.detect_immortal_fall_bug()
+        with profiler.section('ai/detect_immortal_fall_bug'):
+            self.detect_immortal_fall_bug()
         
         # Reset movement
         self.game.movement = [False, False]
         
-        # Try periodic jump (HIGH PRIORITY)
-        if self.try_periodic_jump():
+        # Try periodic jump (HIGH PRIORITY), unless a planned path is being followed
+        with profiler.section('ai/try_periodic_jump'):
+            jumped = not self.path and self.try_periodic_jump()
+        if jumped:
             if self.debug:
                 print("Executed periodic jump!")
         
         # Check if we need to double jump to safety
         if not player.collisions['down']:  # If we're in the air
-            should_double, target_platform = self.should_double_jump()
-            if should_double:
-                if self.try_double_jump(target_platform):
-                    if self.debug:
-                        print("Executed double jump to reach platform!")
-                    return  # Focus on reaching platform
+            # A planned path decides its own mid-air jumps
+            with profiler.section('ai/recover_airborne'):
+                recovering = not self.path and self.recover_airborne()
+            if recovering:
+                return  # Focus on reaching platform
+            if not self.path:
+                with profiler.section('ai/should_double_jump'):
+                    should_double, target_platform = self.should_double_jump()
+                if should_double:
+                    if self.try_double_jump(target_platform):
+                        if self.debug:
+                            print("Executed double jump to reach platform!")
+                        return  # Focus on reaching platform
         else:
             # Reset double jump when on ground
             self.can_double_jump = True
             self.last_ground_time = current_time
         
         # Handle dodging projectiles (HIGHEST PRIORITY)
-        should_dodge, proj_dir, time_to_impact, same_level = self.should_dodge()
+        with profiler.section('ai/should_dodge'):
+            should_dodge, proj_dir, time_to_impact, same_level = self.should_dodge()
         if should_dodge:
             if self.debug:
                 print("DODGE MODE ACTIVATED!")
@@ -1084,36 +1262,50 @@ class AIPlayer:
             return  # Focus on dodging
         
         # Get nearest enemy and distance
-        nearest_enemy, distance = self.get_nearest_enemy()
+        with profiler.section('ai/get_nearest_enemy'):
+            nearest_enemy, distance = self.get_nearest_enemy()
+        if not nearest_enemy:
+            # Nothing at our height, go for the enemy with the cheapest planned path
+            with profiler.section('ai/get_reachable_enemy'):
+                nearest_enemy, distance = self.get_reachable_enemy()
         
         # Attack nearest enemy (Secondary priority)
         if nearest_enemy:
             if self.debug:
                 print(f"Targeting enemy at distance {distance}")
-            dist_x = nearest_enemy.pos[0] - player.pos[0]
-            dist_y = nearest_enemy.pos[1] - player.pos[1]
-            
-            # Set movement direction towards enemy
-            if abs(dist_x) > 20:
-                if dist_x > 0:
-                    self.game.movement[1] = True  # Move right
-                else:
-                    self.game.movement[0] = True  # Move left
-            
-            # Check for obstacles in our path
-            has_obstacle, obstacle_height = self.detect_obstacle()
-            if has_obstacle and player.collisions['down']:
-                if obstacle_height > 8:  # Only jump if obstacle is significant
-                    if self.try_jump("Obstacle in path"):
-                        if self.debug:
-                            print(f"Jumping over obstacle of height: {obstacle_height}px")
+
+            # Enemies on other platforms are reached through the navigation graph,
+            # the direct chase below handles the enemy's own platform
+            with profiler.section('ai/follow_path'):
+                on_path = self.follow_path(nearest_enemy)
+            if not on_path:
+                dist_x = nearest_enemy.pos[0] - player.pos[0]
+                dist_y = nearest_enemy.pos[1] - player.pos[1]
+                
+                # Set movement direction towards enemy
+                if abs(dist_x) > 20:
+                    if dist_x > 0:
+                        self.game.movement[1] = True  # Move right
+                    else:
+                        self.game.movement[0] = True  # Move left
+                
+                # Check for obstacles in our path
+                with profiler.section('ai/detect_obstacle'):
+                    has_obstacle, obstacle_height = self.detect_obstacle()
+                if has_obstacle and player.collisions['down']:
+                    if obstacle_height > 8:  # Only jump if obstacle is significant
+                        if self.try_jump("Obstacle in path"):
+                            if self.debug:
+                                print(f"Jumping over obstacle of height: {obstacle_height}px")
         
         # Add remaining bug detection calls
-        self.detect_decision_bug()
+        with profiler.section('ai/detect_decision_bug'):
+            self.detect_decision_bug()
         
         # Generate report if any bugs are active
         if any(bug['active'] for bug in self.bugs_detected.values()):
-            self.generate_bug_report()
+            with profiler.section('ai/generate_bug_report'):
+                self.generate_bug_report()
             
         # Reset bug states after reporting
         for bug_type in self.bugs_detected:
@@ -0,0 +1,247 @@
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from scripts.utils import BASE_IMG_PATH, Animation
+
+BUNDLE_PATH = 'Assets/.cache/images.bundle'
+BUNDLE_MAGIC = b'HPAB'
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct('<4sHI') #magic, version, json metadata length, followed by the metadata and the pixel data
+PIXEL_FORMAT = 'RGB'
+COLORKEY = (0, 0, 0)
+DECODE_WORKERS = 8
+
+class AssetPipeline:
+    #every image under Assets/images, converted like load_image does:
+    #the images of each folder are packed side by side into one atlas surface and handed out as subsurfaces of it, the root folder's images stand alone.
+    #The converted pixels are kept in an on-disk bundle that is reused while no source png has changed (by mtime and size),
+    #otherwise the pngs are all decoded in a thread pool and the bundle is rebuilt.
+    #From the bundle a folder (or root image) is only read the first time it is asked for, and can be released again
+    def __init__(self, base_path=BASE_IMG_PATH, bundle_path=None, workers=DECODE_WORKERS):
+        self.base_path = base_path
+        self.bundle_path = bundle_path or BUNDLE_PATH
+        self.workers = min(workers, os.cpu_count() or 1)
+        self.folders = {} #folder -> frame surfaces in load_images order
+        self.atlases = {} #folder -> atlas surface
+        self.images = {} #root file name -> surface
+        self.source_names = {} #sources(), to decode a released folder again when there is no bundle
+        self.bundle = None #the bundle's metadata once it is valid, None to fall back on the pngs
+        self.pixels_offset = 0 #where the bundle's pixel data starts
+        self.loaded_from = None #'bundle' or 'pngs', for the startup benchmark
+
+    def sources(self):
+        #{folder: [file names]} in os.listdir order like load_images, '' is the root folder
+        sources = {}
+        for dirpath, dirnames, filenames in os.walk(self.base_path):
+            folder = os.path.relpath(dirpath, self.base_path).replace(os.sep, '/')
+            names = [name for name in os.listdir(dirpath) if name.endswith('.png')]
+            if names:
+                sources['' if folder == '.' else folder] = names
+        return sources
+
+    def manifest(self, sources):
+        manifest = []
+        for folder, names in sorted(sources.items()):
+            for name in names:
+                stat = os.stat(self.source_path(folder, name))
+                manifest.append([folder, name, stat.st_mtime_ns, stat.st_size])
+        return manifest
+
+    def source_path(self, folder, name):
+        return self.base_path + (folder + '/' if folder else '') + name
+
+    def load(self):
+        self.source_names = self.sources()
+        manifest = self.manifest(self.source_names)
+        if self.read_bundle(manifest):
+            self.loaded_from = 'bundle'
+        else:
+            self.decode(self.source_names)
+            self.write_bundle(manifest)
+            self.loaded_from = 'pngs'
+        return self
+
+    def load_all(self):
+        for folder, names in self.source_names.items():
+            if folder:
+                self.load_images(folder)
+            else:
+                for name in names:
+                    self.load_image(name)
+        return self
+
+    def decode(self, sources):
+        paths = [(folder, name) for folder, names in sources.items() for name in names]
+        #pygame releases the GIL while it decodes, converting to the display format has to happen here on the main thread
+        load = lambda path: pygame.image.load(self.source_path(*path))
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                decoded = list(pool.map(load, paths))
+        else:
+            decoded = [load(path) for path in paths] #a pool on a single core only adds thread hand-offs
+        surfaces = {}
+        for path, img in zip(paths, decoded):
+            surfaces[path] = img.convert()
+
+        for folder, names in sources.items():
+            if not folder:
+                for name in names:
+                    self.add_image(name, surfaces[(folder, name)])
+                continue
+            frames = [surfaces[(folder, name)] for name in names]
+            atlas = pygame.Surface((sum(frame.get_width() for frame in frames), max(frame.get_height() for frame in frames)))
+            rects = []
+            x = 0
+            for frame in frames:
+                rects.append(atlas.blit(frame, (x, 0)))
+                x += frame.get_width()
+            self.add_atlas(folder, atlas, rects)
+
+    def add_image(self, name, img):
+        img.set_colorkey(COLORKEY)
+        self.images[name] = img
+
+    def add_atlas(self, folder, atlas, rects):
+        atlas.set_colorkey(COLORKEY)
+        self.atlases[folder] = atlas
+        self.folders[folder] = [atlas.subsurface(rect) for rect in rects]
+
+    def read_bundle(self, manifest):
+        #only the header and metadata, the pixels are read per folder as they are asked for
+        try:
+            with open(self.bundle_path, 'rb') as f:
+                header = f.read(BUNDLE_HEADER.size)
+                if len(header) < BUNDLE_HEADER.size:
+                    return False
+                magic, version, meta_size = BUNDLE_HEADER.unpack(header)
+                if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                    return False
+                meta = json.loads(f.read(meta_size))
+        except (OSError, ValueError):
+            return False
+        if meta['manifest'] != manifest:
+            return False
+        self.bundle = meta
+        self.pixels_offset = BUNDLE_HEADER.size + meta_size
+        return True
+
+    def read_surface(self, entry):
+        size = tuple(entry['size'])
+        with open(self.bundle_path, 'rb') as f:
+            f.seek(self.pixels_offset + entry['offset'])
+            data = f.read(size[0] * size[1] * len(PIXEL_FORMAT))
+        return pygame.image.frombuffer(data, size, PIXEL_FORMAT).convert()
+
+    def fetch(self, folder, name=None):
+        #a folder (or root image) that was not loaded yet or was released, from its slice of the bundle or without one from its pngs
+        if self.bundle is None:
+            self.decode({folder: [name] if name else self.source_names[folder]})
+        elif name:
+            self.add_image(name, self.read_surface(self.bundle['images'][name]))
+        else:
+            entry = self.bundle['atlases'][folder]
+            self.add_atlas(folder, self.read_surface(entry), [pygame.Rect(rect) for rect in entry['frames']])
+
+    def write_bundle(self, manifest):
+        meta = {'manifest': manifest, 'images': {}, 'atlases': {}}
+        blobs = []
+        offset = 0
+        def entry(img):
+            nonlocal offset
+            blob = pygame.image.tobytes(img, PIXEL_FORMAT)
+            blobs.append(blob)
+            offset += len(blob)
+            return {'size': list(img.get_size()), 'offset': offset - len(blob)}
+        for name, img in self.images.items():
+            meta['images'][name] = entry(img)
+        for folder, atlas in self.atlases.items():
+            meta['atlases'][folder] = dict(entry(atlas), frames=[list(frame.get_offset()) + list(frame.get_size()) for frame in self.folders[folder]])
+        meta_bytes = json.dumps(meta).encode('utf-8')
+
+        #the bundle is only a cache, a read-only checkout just decodes the pngs every time
+        try:
+            os.makedirs(os.path.dirname(self.bundle_path), exist_ok=True)
+            with open(self.bundle_path + '.tmp', 'wb') as f:
+                f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(meta_bytes)))
+                f.write(meta_bytes)
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(self.bundle_path + '.tmp', self.bundle_path)
+        except OSError:
+            return
+        self.bundle = meta
+        self.pixels_offset = BUNDLE_HEADER.size + len(meta_bytes)
+
+    def load_image(self, path):
+        if path not in self.images:
+            self.fetch('', path)
+        return self.images[path]
+
+    def load_images(self, path):
+        if path not in self.folders:
+            self.fetch(path)
+        return list(self.folders[path])
+
+    def release(self, path):
+        #a folder or root image, dropped until it is asked for again (whoever still holds its surfaces keeps them alive)
+        self.folders.pop(path, None)
+        self.atlases.pop(path, None)
+        self.images.pop(path, None)
+
+class AssetRegistry:
+    #the game's self.assets: looked up by name like a dict, but each asset is only made from the pipeline the first time it is used.
+    #Assets can be put in groups (a character's animations, a tile set) that are prefetched or released together
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.assets = {} #name -> loaded asset
+        self.loaders = {} #name -> function making the asset
+        self.paths = {} #name -> the pipeline folder or root image it is made from
+        self.groups = {} #group -> asset names
+
+    def add(self, name, loader, path=None, group=None):
+        self.loaders[name] = loader
+        if path is not None:
+            self.paths[name] = path
+        if group is not None:
+            self.groups.setdefault(group, []).append(name)
+
+    def image(self, name, path, group=None):
+        self.add(name, lambda: self.pipeline.load_image(path), path, group)
+
+    def images(self, name, path, group=None):
+        self.add(name, lambda: self.pipeline.load_images(path), path, group)
+
+    def animation(self, name, path, group=None, **kwargs):
+        self.add(name, lambda: Animation(self.pipeline.load_images(path), **kwargs), path, group)
+
+    def __getitem__(self, name):
+        try:
+            return self.assets[name]
+        except KeyError:
+            asset = self.assets[name] = self.loaders[name]()
+            return asset
+
+    def __contains__(self, name):
+        return name in self.loaders
+
+    def __iter__(self):
+        return iter(self.loaders)
+
+    def __len__(self):
+        return len(self.loaders)
+
+    def loaded(self):
+        return list(self.assets)
+
+    def prefetch(self, group):
+        for name in self.groups[group]:
+            self[name]
+
+    def release(self, group):
+        for name in self.groups[group]:
+            if self.assets.pop(name, None) is not None and name in self.paths:
+                self.pipeline.release(self.paths[name])
@@ -0,0 +1,48 @@
+FPS = 60 #simulated frames per second of game time
+SPEEDS = [1, 2, 4, 8, 16, 50] #fast-forward multipliers, cycled in game
+
+class GameClock:
+    #game time counted in simulated frames, so timers behave the same at any real frame rate
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.frame = 0
+        self.paused = False
+        self.pending_steps = 0 #single steps requested while paused
+        self.speed = 1
+
+    def get_ticks(self):
+        #milliseconds of game time, a drop-in for pygame.time.get_ticks()
+        return self.frame * 1000 // self.fps
+
+    def advance(self):
+        #called once per simulated frame, returns False when paused with no step pending
+        if self.paused:
+            if not self.pending_steps:
+                return False
+            self.pending_steps -= 1
+        self.frame += 1
+        return True
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self.pending_steps = 0
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self, frames=1):
+        #advance exactly this many frames while paused
+        self.pending_steps += frames
+
+    def fast_forward(self, speed=None):
+        #sets the speed, or cycles to the next one
+        if speed is None:
+            speed = SPEEDS[(SPEEDS.index(self.speed) + 1) % len(SPEEDS)] if self.speed in SPEEDS else 1
+        self.speed = speed
+        return self.speed
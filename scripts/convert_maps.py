@@ -0,0 +1,18 @@
+#converts json maps into the binary .map format, run from the repo root: python -m scripts.convert_maps [map.json ...]
+import glob
+import os
+import sys
+
+from scripts.tilemap import Tilemap, MAP_EXT
+
+def convert(path):
+    tilemap = Tilemap(None)
+    tilemap.load(path)
+    out_path = os.path.splitext(path)[0] + MAP_EXT
+    tilemap.save_binary(out_path)
+    return out_path
+
+if __name__ == '__main__':
+    for path in sys.argv[1:] or sorted(glob.glob('Assets/maps/*.json')):
+        out_path = convert(path)
+        print(path, '->', out_path, '(' + str(os.path.getsize(path)) + ' -> ' + str(os.path.getsize(out_path)) + ' bytes)')
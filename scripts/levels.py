@@ -0,0 +1,43 @@
+from collections import OrderedDict, namedtuple
+
+#everything load_level needs to (re)start a level, parsed once per map and never modified afterwards
+LevelTemplate = namedtuple('LevelTemplate', ['tile_size', 'grid', 'offgrid_tiles', 'leaf_spawners', 'player_spawn', 'enemy_spawns', 'tile_types'])
+
+def build_level_template(tilemap, path):
+    #parses the map into the given tilemap and snapshots it, so a cache miss leaves the tilemap ready to play
+    tilemap.load(path)
+
+    leaf_spawners = []
+    for tree in tilemap.extract([('large_decor', 2)], keep=True):
+        leaf_spawners.append((4 + tree['pos'][0], 4 + tree['pos'][1], 23, 13))
+
+    player_spawn = None
+    enemy_spawns = []
+    for spawner in tilemap.extract([('spawners', 0), ('spawners', 1)]):
+        if spawner['variant'] == 0:
+            player_spawn = tuple(spawner['pos'])
+        else:
+            enemy_spawns.append(tuple(spawner['pos']))
+
+    tile_types = frozenset([tile[0] for tile in tilemap.grid.values()] + [tile['type'] for tile in tilemap.offgrid_tiles]) #the tile sets the level draws
+    template = LevelTemplate(tilemap.tile_size, dict(tilemap.grid), tuple(tilemap.offgrid_tiles), tuple(leaf_spawners), player_spawn, tuple(enemy_spawns), tile_types)
+    tilemap.template = template
+    return template
+
+class LevelCache:
+    def __init__(self, load, maxsize=4):
+        self.load = load
+        self.maxsize = maxsize
+        self.templates = OrderedDict() #least recently used first
+
+    def get(self, map_id):
+        if map_id in self.templates:
+            self.templates.move_to_end(map_id)
+        else:
+            self.templates[map_id] = self.load(map_id)
+            if len(self.templates) > self.maxsize:
+                self.templates.popitem(last=False)
+        return self.templates[map_id]
+
+    def clear(self):
+        self.templates.clear()
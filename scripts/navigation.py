@@ -0,0 +1,197 @@
+import heapq
+import math
+
+#rough reach of the player's moves in tiles, from the physics in Entities.py:
+#a jump starts at -3px/frame under 0.1px/frame gravity, so it rises ~45px and stays up ~60 frames at 1px/frame walking speed,
+#a dash moves at 8px/frame for 10 frames
+JUMP_RISE = 2
+JUMP_SPAN = 3
+DASH_SPAN = 4
+
+#(jumps, dashes) per character, Bobo's dash comes in two bursts
+CHARACTER_MOVES = {'Okarin': (3, 1), 'Bobo': (1, 2)}
+
+JUMP_COST = 16 #extra cost per jump/dash so the planner prefers walking and dropping, in pixels
+MAX_CACHED_PATHS = 256
+
+class Segment:
+    def __init__(self, index, row, left, right):
+        self.index = index
+        self.row = row #tile row of the ground, the player stands on its top edge
+        self.left = left #first and last tile column, inclusive
+        self.right = right
+
+class Edge:
+    def __init__(self, kind, source, target, launch_x, land_x, direction, jumps=0, dashes=0, cost=0):
+        self.kind = kind #'drop', 'jump', 'multi_jump' or 'dash'
+        self.source = source
+        self.target = target
+        self.launch_x = launch_x #pixel x to leave the source segment from
+        self.land_x = land_x #pixel x to aim for on the target segment
+        self.direction = direction #-1 left, 1 right
+        self.jumps = jumps
+        self.dashes = dashes
+        self.cost = cost
+
+class NavGraph:
+    def __init__(self, tilemap, jumps=1, dashes=1):
+        self.tile_size = tilemap.tile_size
+        self.jumps = jumps
+        self.dashes = dashes
+        self.segments = []
+        self.segment_tiles = {} #ground tile loc -> segment standing on it
+        self.edges = {} #segment index -> outgoing edges
+
+        self.build_segments(tilemap)
+        for segment in self.segments:
+            self.edges[segment.index] = self.drop_edges(tilemap, segment) + self.jump_edges(segment)
+
+    def build_segments(self, tilemap):
+        #runs of platform tops with room for the player (two tiles of air) above them
+        tops = set()
+        for bucket in tilemap.platform_tops.values():
+            for loc in bucket:
+                if (loc[0], loc[1] - 2) not in tilemap.solid:
+                    tops.add(loc)
+
+        for loc in sorted(tops, key=lambda loc: (loc[1], loc[0])):
+            if (loc[0] - 1, loc[1]) in tops:
+                segment = self.segment_tiles[(loc[0] - 1, loc[1])]
+                segment.right = loc[0]
+            else:
+                segment = Segment(len(self.segments), loc[1], loc[0], loc[0])
+                self.segments.append(segment)
+            self.segment_tiles[loc] = segment
+
+    def tile_center(self, tile_x):
+        return tile_x * self.tile_size + self.tile_size // 2
+
+    def drop_edges(self, tilemap, segment):
+        #walking off either end of the segment and falling straight down
+        edges = []
+        for direction, edge_x in [(-1, segment.left - 1), (1, segment.right + 1)]:
+            if (edge_x, segment.row - 1) in tilemap.solid: #a wall, not an edge
+                continue
+            land_y = tilemap.solid_below((edge_x * self.tile_size, segment.row * self.tile_size))
+            target = self.segment_tiles.get((edge_x, land_y))
+            if target and target is not segment:
+                fall = (target.row - segment.row) * self.tile_size
+                edges.append(Edge('drop', segment, target, self.tile_center(edge_x), self.tile_center(edge_x), direction, cost=self.tile_size + fall * 0.5))
+        return edges
+
+    def jump_edges(self, segment):
+        edges = []
+        for target in self.segments:
+            if target is segment:
+                continue
+            rise = segment.row - target.row #in tiles, positive when the target is higher
+            if target.left > segment.right:
+                direction, launch, land = 1, segment.right, target.left
+            elif target.right < segment.left:
+                direction, launch, land = -1, segment.left, target.right
+            elif rise > 0 and segment.left < target.left:
+                #the target overhangs us, jump up past its left end
+                direction, launch, land = 1, target.left - 1, target.left
+            elif rise > 0 and segment.right > target.right:
+                direction, launch, land = -1, target.right + 1, target.right
+            else:
+                continue
+            gap = abs(land - launch) - 1
+
+            jumps = max(1, math.ceil(rise / JUMP_RISE)) if rise > 0 else 1
+            #every jump covers JUMP_SPAN tiles, falling to a lower target gives some extra drift
+            drift = max(0, -rise) // 2
+            jumps = max(jumps, math.ceil(max(0, gap - drift) / JUMP_SPAN))
+            dashes = 0
+            if jumps > self.jumps:
+                if rise > 0 and math.ceil(rise / JUMP_RISE) > self.jumps:
+                    continue
+                dashes = math.ceil((gap - drift - self.jumps * JUMP_SPAN) / DASH_SPAN)
+                if dashes > self.dashes:
+                    continue
+                jumps = self.jumps
+
+            if dashes:
+                kind = 'dash'
+            elif jumps > 1:
+                kind = 'multi_jump'
+            else:
+                kind = 'jump'
+            distance = math.hypot((land - launch) * self.tile_size, rise * self.tile_size)
+            edges.append(Edge(kind, segment, target, self.tile_center(launch), self.tile_center(land), direction, jumps, dashes, distance + (jumps + dashes) * JUMP_COST))
+        return edges
+
+    def segment_under(self, rect):
+        #the segment the rect is standing on, or None while it is airborne
+        tile_y = rect.bottom // self.tile_size
+        for x in (rect.centerx, rect.left, rect.right - 1):
+            segment = self.segment_tiles.get((x // self.tile_size, tile_y))
+            if segment:
+                return segment
+        return None
+
+    def find_path(self, start, goal):
+        #A* over segments, the heuristic is the height left to climb, or half the height left to fall (what a drop costs).
+        #It must never exceed the real cost for the path to be the cheapest: height only changes along edges,
+        #but walking along a segment is free, so no horizontal distance can be counted
+        def estimate(segment):
+            dy = (goal.row - segment.row) * self.tile_size
+            return -dy if dy < 0 else dy * 0.5
+
+        open_heap = [(estimate(start), 0, start.index)]
+        came_from = {}
+        best = {start.index: 0}
+        while open_heap:
+            _, cost, index = heapq.heappop(open_heap)
+            if index == goal.index:
+                path = []
+                while index in came_from:
+                    path.append(came_from[index])
+                    index = came_from[index].source.index
+                return path[::-1]
+            if cost > best[index]:
+                continue
+            for edge in self.edges[index]:
+                new_cost = cost + edge.cost
+                if new_cost < best.get(edge.target.index, float('inf')):
+                    best[edge.target.index] = new_cost
+                    came_from[edge.target.index] = edge
+                    heapq.heappush(open_heap, (new_cost + estimate(edge.target), new_cost, edge.target.index))
+        return None
+
+class Navigator:
+    def __init__(self, game):
+        self.game = game
+        self.graph = None
+        self.graph_key = None
+        self.paths = {} #(start index, goal index) -> path, for the current graph
+
+    def current_graph(self):
+        #rebuilt when the level (or the character) changes, an edited tilemap has no template and is rebuilt every time
+        tilemap = self.game.tilemap
+        moves = CHARACTER_MOVES.get(self.game.characterlist[self.game.i], (1, 1))
+        key = (tilemap.template, moves)
+        if self.graph is None or key != self.graph_key or tilemap.template is None:
+            self.graph = NavGraph(tilemap, jumps=moves[0], dashes=moves[1])
+            self.graph_key = key
+            self.paths = {}
+        return self.graph
+
+    def segment_under(self, rect):
+        return self.current_graph().segment_under(rect)
+
+    def block_edge(self, edge):
+        #an edge the player failed to make (the reach estimates are rough), plan around it until the level changes
+        edges = self.current_graph().edges[edge.source.index]
+        if edge in edges:
+            edges.remove(edge)
+            self.paths = {}
+
+    def find_path(self, start, goal):
+        graph = self.current_graph()
+        key = (start.index, goal.index)
+        if key not in self.paths:
+            if len(self.paths) >= MAX_CACHED_PATHS:
+                self.paths = {}
+            self.paths[key] = graph.find_path(start, goal)
+        return self.paths[key]
@@ -0,0 +1,45 @@
+import weakref
+
+import pygame
+
+OUTLINE_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+OUTLINE_COLOR = (0, 0, 0, 180)
+
+class OutlineCache:
+    #the drop-shadow outline of each image, the silhouette blitted at the 4 offsets composed into one surface 1px larger on every side,
+    #made the first time the image is drawn; images must not be drawn on after that (tile chunks are rebaked into new surfaces)
+    def __init__(self):
+        self.outlines = weakref.WeakKeyDictionary()
+
+    def get(self, img):
+        outline = self.outlines.get(img)
+        if outline is None:
+            silhouette = pygame.mask.from_surface(img).to_surface(setcolor=OUTLINE_COLOR, unsetcolor=(0, 0, 0, 0))
+            outline = pygame.Surface((img.get_width() + 2, img.get_height() + 2), pygame.SRCALPHA)
+            for offset in OUTLINE_OFFSETS:
+                outline.blit(silhouette, (1 + offset[0], 1 + offset[1]))
+            self.outlines[img] = outline
+        return outline
+
+class OutlinedSurface:
+    #stands in for the surface the outlined layer is drawn on, every image blitted to it also has its outline blitted to shadow_surf,
+    #instead of masking the whole layer every frame
+    def __init__(self, surf, shadow_surf, cache):
+        self.surf = surf
+        self.shadow_surf = shadow_surf
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.surf, name)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if area is None:
+            #blit truncates float positions, the outline has to land on the same pixel
+            self.shadow_surf.blit(self.cache.get(source), (int(dest[0]) - 1, int(dest[1]) - 1))
+        return self.surf.blit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=True):
+        blit_sequence = list(blit_sequence)
+        get = self.cache.get
+        self.shadow_surf.blits([(get(blit[0]), (int(blit[1][0]) - 1, int(blit[1][1]) - 1)) for blit in blit_sequence if len(blit) == 2], False)
+        return self.surf.blits(blit_sequence, doreturn)
@@ -1,24 +1,64 @@
-class Particle:
-    def __init__(self, game, p_type, pos, velocity=[0, 0], frame=0):
-        self.game = game
-        self.type = p_type
-        self.pos = list(pos)
-        self.velocity = list(velocity)
-        self.animation = self.game.assets['particle/' + p_type].copy()
-        self.animation.frame = frame
-    
+import math
+
+from scripts.pool import Pool
+from scripts.viewport import NULL_VIEWPORT
+
+SWAY_TYPES = {'leaf'} #particle types that drift side to side as they fall
+
+class ParticleSystem(Pool):
+    #every particle in a pool instead of an object with its own Animation
+    FIELDS = ('x', 'y', 'vx', 'vy', 'frame', 'type')
+
+    def __init__(self, assets):
+        super().__init__()
+        self.assets = assets
+        self.types = {} #particle type -> index into the per type tables, added on the type's first spawn
+        self.frame_images = [] #per type, the image shown on each animation frame
+        self.frame_shifts = [] #per type, the half size of that image, to center it
+        self.frame_sway = [] #per type, the sideways drift added on each animation frame
+        self.last_frames = []
+
+    def add_type(self, p_type, animation):
+        last_frame = animation.img_duration * len(animation.images) - 1
+        images = [animation.images[int(frame / animation.img_duration)] for frame in range(last_frame + 1)]
+        self.types[p_type] = len(self.last_frames)
+        self.frame_images.append(images)
+        self.frame_shifts.append([(img.get_width() // 2, img.get_height() // 2) for img in images])
+        self.frame_sway.append([math.sin(frame * 0.035) * 0.3 if p_type in SWAY_TYPES else 0 for frame in range(last_frame + 1)])
+        self.last_frames.append(last_frame)
+        return self.types[p_type]
+
+    def spawn(self, p_type, pos, velocity=(0, 0), frame=0):
+        try:
+            type_index = self.types[p_type]
+        except KeyError:
+            type_index = self.add_type(p_type, self.assets['particle/' + p_type])
+        super().spawn(pos[0], pos[1], velocity[0], velocity[1], frame, type_index)
+
     def update(self):
-        kill = False
-        if self.animation.done:
-            kill = True
-        
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
-        
-        self.animation.update()
-        
-        return kill
-    
-    def render(self, surf, offset=(0, 0)):
-        img = self.animation.img()
-        surf.blit(img, (self.pos[0] - offset[0] - img.get_width() // 2, self.pos[1] - offset[1] - img.get_height() // 2))
\ No newline at end of file
+        #a particle lives one more frame after its animation reaches the last frame, like the old Particle did
+        xs, ys, vxs, vys, frames, types = self.x, self.y, self.vx, self.vy, self.frame, self.type
+        last_frames = self.last_frames
+        frame_sway = self.frame_sway
+        for i in self.backwards():
+            p_type = types[i]
+            frame = frames[i]
+            if frame >= last_frames[p_type]:
+                self.remove(i)
+                continue
+            frame += 1
+            frames[i] = frame
+            xs[i] += vxs[i] + frame_sway[p_type][frame]
+            ys[i] += vys[i]
+
+    def render(self, surf, offset=(0, 0), viewport=NULL_VIEWPORT):
+        frame_images = self.frame_images
+        frame_shifts = self.frame_shifts
+        left, top, right, bottom = viewport.bounds()
+        blits = []
+        for x, y, frame, p_type in zip(self.x[:self.count], self.y[:self.count], self.frame, self.type):
+            if left < x < right and top < y < bottom:
+                shift = frame_shifts[p_type][frame]
+                blits.append((frame_images[p_type][frame], (x - offset[0] - shift[0], y - offset[1] - shift[1])))
+        viewport.count('particles', len(blits), self.count - len(blits))
+        surf.blits(blits, False)
@@ -0,0 +1,41 @@
+class Pool:
+    #objects kept as one flat list per field (index i across them is one object) instead of an object each.
+    #Subclasses name their fields in FIELDS, each becomes a list attribute. The first count slots are live;
+    #removing swaps the last live object into the hole, so nothing shifts and the lists only grow to the peak count
+    FIELDS = ()
+
+    def __init__(self):
+        self.count = 0
+        self.columns = []
+        for field in self.FIELDS:
+            column = []
+            setattr(self, field, column)
+            self.columns.append(column)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, *values):
+        #the values in FIELDS order
+        i = self.count
+        if i == len(self.columns[0]):
+            for column, value in zip(self.columns, values):
+                column.append(value)
+        else:
+            for column, value in zip(self.columns, values):
+                column[i] = value
+        self.count += 1
+
+    def remove(self, i):
+        last = self.count - 1
+        if i != last:
+            for column in self.columns:
+                column[i] = column[last]
+        self.count = last
+
+    def backwards(self):
+        #the live slots for an update that removes as it goes: backwards, so the object swapped into a removed slot has already been updated
+        return range(self.count - 1, -1, -1)
@@ -0,0 +1,139 @@
+import weakref
+
+import pygame
+
+PRESENT_MODES = ['stretch', 'integer', 'gpu', 'dirty']
+DIRTY_TILES = (10, 10) #columns and rows of tiles the frame is compared in, in dirty mode
+
+class Presenter:
+    #puts the small game frame on the window, scaled up:
+    #stretch scales it to the whole window, integer by the largest whole factor that fits (centered),
+    #gpu opens the window in SDL's SCALED mode so the renderer scales it, and dirty is integer but only redraws and updates the tiles that changed
+    def __init__(self, mode, frame_size, window_size, headless=False):
+        if mode not in PRESENT_MODES:
+            raise ValueError(f"unknown presentation mode {mode!r}, expected one of {PRESENT_MODES}")
+        self.mode = mode
+        self.frame_size = frame_size
+
+        if headless:
+            self.window = pygame.display.set_mode((1, 1))#images still need a display mode to convert() against
+            window_size = (1, 1)
+        elif mode == 'gpu':
+            self.window = pygame.display.set_mode(frame_size, pygame.SCALED)
+        else:
+            self.window = pygame.display.set_mode(window_size)
+        #the surface the menus draw on, laid out for the full window; in gpu mode it is scaled down onto the window when shown
+        self.screen = pygame.Surface(window_size) if self.window.get_size() != window_size else self.window
+
+        if mode in ('integer', 'dirty'):
+            self.factor = max(1, min(window_size[0] // frame_size[0], window_size[1] // frame_size[1]))
+            self.scaled_size = (frame_size[0] * self.factor, frame_size[1] * self.factor)
+        else:
+            self.factor = None
+            self.scaled_size = self.window.get_size()
+        self.origin = ((self.window.get_width() - self.scaled_size[0]) // 2, (self.window.get_height() - self.scaled_size[1]) // 2)
+        self.scaled = pygame.Surface(self.scaled_size) #reused destination when the frame is shaken off its spot
+        fits = self.scaled_size[0] <= self.window.get_width() and self.scaled_size[1] <= self.window.get_height()
+        self.window_area = self.window.subsurface(pygame.Rect(self.origin, self.scaled_size)) if fits else None #scaled straight into when not shaking
+
+        self.dirty_rects = None #window rects to update, None for the whole window
+        self.clear_window = False #the menus were shown, the next game frame clears what they left around it
+        self.overlay_rects = []
+        self.scaled_overlays = weakref.WeakKeyDictionary() #overlay image -> its copy scaled to the window, when the screen is not the window
+        if mode == 'dirty':
+            self.previous = pygame.Surface(frame_size)
+            self.previous_valid = False
+            self.diff = pygame.Surface(frame_size)
+            self.diff.set_colorkey((0, 0, 0))
+            self.diff_2 = pygame.Surface(frame_size)
+            tile_w = -(-frame_size[0] // DIRTY_TILES[0])
+            tile_h = -(-frame_size[1] // DIRTY_TILES[1])
+            self.tiles = [pygame.Rect(x, y, tile_w, tile_h).clip((0, 0), frame_size) for x in range(0, frame_size[0], tile_w) for y in range(0, frame_size[1], tile_h)]
+
+    def present(self, frame, offset=(0, 0)):
+        #offset is the screenshake, in window pixels
+        shaking = offset[0] or offset[1]
+        #last frame's overlays may hang over the border around the frame, which is not redrawn
+        for rect in self.overlay_rects:
+            self.window.fill((0, 0, 0), rect)
+        if self.mode == 'dirty':
+            if self.previous_valid and not shaking:
+                self.present_dirty(frame)
+                return
+            self.previous.blit(frame, (0, 0))
+            self.previous_valid = not shaking
+        self.dirty_rects = None
+        self.overlay_rects = []
+        if self.clear_window:
+            self.window.fill((0, 0, 0))
+            self.clear_window = False
+
+        if self.mode == 'gpu':
+            if shaking:
+                self.window.fill((0, 0, 0))
+            #the window is only frame sized, so the shake is scaled down with the menus' screen
+            scale = self.window.get_width() / self.screen.get_width()
+            self.window.blit(frame, (offset[0] * scale, offset[1] * scale))
+        elif not shaking and self.window_area is not None:
+            pygame.transform.scale(frame, self.scaled_size, self.window_area)
+        else:
+            self.window.fill((0, 0, 0))
+            pygame.transform.scale(frame, self.scaled_size, self.scaled)
+            self.window.blit(self.scaled, (self.origin[0] + offset[0], self.origin[1] + offset[1]))
+
+    def changed_rects(self, frame):
+        #|previous - frame| per channel, black wherever nothing changed, then the bounding rect of what changed in each tile
+        self.diff.blit(self.previous, (0, 0))
+        self.diff.blit(frame, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+        self.diff_2.blit(frame, (0, 0))
+        self.diff_2.blit(self.previous, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+        self.diff.blit(self.diff_2, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        rects = []
+        for tile in self.tiles:
+            rect = self.diff.subsurface(tile).get_bounding_rect()
+            if rect.w:
+                rects.append(rect.move(tile.topleft))
+        return rects
+
+    def present_dirty(self, frame):
+        rects = self.changed_rects(frame)
+        #whatever was overlaid last frame is drawn over from the frame again
+        for rect in self.overlay_rects:
+            rect = rect.move(-self.origin[0], -self.origin[1])
+            rects.append(pygame.Rect(rect.x // self.factor, rect.y // self.factor, rect.w // self.factor + 2, rect.h // self.factor + 2).clip((0, 0), self.frame_size))
+        self.dirty_rects = self.overlay_rects
+        self.overlay_rects = []
+        for rect in rects:
+            if rect.w and rect.h:
+                window_rect = pygame.Rect(self.origin[0] + rect.x * self.factor, self.origin[1] + rect.y * self.factor, rect.w * self.factor, rect.h * self.factor)
+                pygame.transform.scale(frame.subsurface(rect), window_rect.size, self.window.subsurface(window_rect))
+                self.dirty_rects.append(window_rect)
+        self.previous.blit(frame, (0, 0))
+
+    def overlay(self, img, pos):
+        #window-space UI (laid out for the full window) drawn over the presented frame
+        if self.screen is not self.window:
+            scale = self.window.get_width() / self.screen.get_width()
+            scaled = self.scaled_overlays.get(img)
+            if scaled is None:
+                scaled = self.scaled_overlays[img] = pygame.transform.smoothscale_by(img, scale)
+            img = scaled
+            pos = (pos[0] * scale, pos[1] * scale)
+        rect = self.window.blit(img, pos)
+        self.overlay_rects.append(rect)
+        if self.dirty_rects is not None:
+            self.dirty_rects.append(rect)
+
+    def update(self, menus=False):
+        #menus: the frame is the menus drawn on screen rather than a presented game frame
+        if menus:
+            self.clear_window = True
+            if self.mode == 'dirty':
+                self.previous_valid = False
+            if self.screen is not self.window:
+                pygame.transform.smoothscale(self.screen, self.window.get_size(), self.window)
+            pygame.display.update()
+        elif self.dirty_rects is not None:
+            pygame.display.update(self.dirty_rects)
+        else:
+            pygame.display.update()
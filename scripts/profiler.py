@@ -0,0 +1,153 @@
+import csv
+import os
+import time
+
+import pygame
+
+PROFILE_FRAMES = 600 #frames of timings kept, the last 10 seconds at 60 fps
+PROFILE_CSV = 'Logs/profile.csv'
+PERCENTILES = (50, 95, 99)
+OVERLAY_REFRESH = 30 #frames between redraws of the overlay's numbers
+
+class NullSection:
+    #what section() hands out while the profiler is off, one shared instance that does nothing
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SECTION = NullSection()
+
+class Section:
+    #one named part of the frame, its time added up over every time it is entered during the frame
+    def __init__(self, current, index):
+        self.current = current
+        self.index = index
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.current[self.index] += time.perf_counter() - self.start
+        return False
+
+class Profiler:
+    #time spent per frame in named sections of the game loop, used as `with profiler.section('name'):`.
+    #Each section has a ring buffer of its times over the last PROFILE_FRAMES frames, allocated once when the section is first entered.
+    #Off, section() returns the shared NullSection, so the instrumented code only pays for a method call
+    def __init__(self, enabled=False, frames=PROFILE_FRAMES, csv_path=PROFILE_CSV):
+        self.capacity = frames
+        self.csv_path = csv_path
+        self.names = [] #section names, in the order they were first entered
+        self.sections = {} #name -> Section
+        self.rings = [] #per section, its time in each of the kept frames
+        self.current = [] #per section, its time so far this frame
+        self.frame = 0 #frames recorded
+        self.frame_start = 0
+        self.enabled = False
+        self.show_overlay = False
+        self.overlay_img = None
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        #'total' is the whole loop iteration, from one end_frame to the next
+        self.enabled = True
+        self.frame_start = time.perf_counter()
+        if 'total' not in self.sections:
+            self.add_section('total')
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        try:
+            return self.sections[name]
+        except KeyError:
+            return self.add_section(name)
+
+    def add_section(self, name):
+        section = self.sections[name] = Section(self.current, len(self.names))
+        self.names.append(name)
+        self.rings.append([0.0] * self.capacity)
+        self.current.append(0.0)
+        return section
+
+    def end_frame(self):
+        #called once at the end of every loop iteration, moves this frame's times into the rings
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        current = self.current
+        current[0] = now - self.frame_start
+        self.frame_start = now
+        slot = self.frame % self.capacity
+        for i, ring in enumerate(self.rings):
+            ring[slot] = current[i]
+            current[i] = 0.0
+        self.frame += 1
+
+    def kept_frames(self):
+        #slots of the rings holding recorded frames, oldest first
+        if self.frame <= self.capacity:
+            return list(range(self.frame))
+        start = self.frame % self.capacity
+        return list(range(start, self.capacity)) + list(range(start))
+
+    def percentiles(self, name):
+        #nearest-rank percentiles of the section's time per frame over the kept frames, in milliseconds
+        ring = self.rings[self.names.index(name)]
+        times = sorted(ring[slot] for slot in self.kept_frames())
+        if not times:
+            return [0.0 for p in PERCENTILES]
+        return [times[min(len(times) - 1, len(times) * p // 100)] * 1000 for p in PERCENTILES]
+
+    def summary(self):
+        #the percentiles as lines of text, for the end of a headless session
+        width = max(len(name) for name in self.names + ['section']) + 2
+        lines = [f'{"section":<{width}}' + ''.join(f'{"p" + str(p):>10}' for p in PERCENTILES)]
+        for name in self.names:
+            lines.append(f'{name:<{width}}' + ''.join(f'{ms:8.3f}ms' for ms in self.percentiles(name)))
+        return lines
+
+    def toggle_overlay(self):
+        #the overlay needs timings, so showing it turns the profiler on
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay and not self.enabled:
+            self.enable()
+        self.overlay_img = None
+
+    def overlay(self, font):
+        #the percentiles as a table on one surface, only redrawn every OVERLAY_REFRESH frames
+        if self.overlay_img is None or self.frame % OVERLAY_REFRESH == 0:
+            rows = [['section'] + ['p' + str(p) for p in PERCENTILES]]
+            for name in self.names:
+                rows.append([name] + [f'{ms:.2f}ms' for ms in self.percentiles(name)])
+            cells = [[font.render(cell, True, 'white') for cell in row] for row in rows]
+            name_width = max(row[0].get_width() for row in cells) + 15
+            column_width = max(cell.get_width() for row in cells for cell in row[1:]) + 15
+            line_height = max(cell.get_height() for row in cells for cell in row)
+            self.overlay_img = pygame.Surface((name_width + column_width * len(PERCENTILES) + 10, line_height * len(rows) + 10), pygame.SRCALPHA)
+            self.overlay_img.fill((0, 0, 0, 160))
+            for y, row in enumerate(cells):
+                self.overlay_img.blit(row[0], (5, 5 + y * line_height))
+                for x, cell in enumerate(row[1:]):
+                    #numbers right-aligned in their column
+                    self.overlay_img.blit(cell, (5 + name_width + column_width * (x + 1) - cell.get_width(), 5 + y * line_height))
+        return self.overlay_img
+
+    def dump(self, path=None):
+        #the kept frames as CSV, a row per frame and a column of milliseconds per section
+        if not self.enabled or not self.frame:
+            return None
+        path = path or self.csv_path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + [name + ' (ms)' for name in self.names])
+            first = max(0, self.frame - self.capacity)
+            for frame, slot in enumerate(self.kept_frames(), first):
+                writer.writerow([frame] + [f'{ring[slot] * 1000:.4f}' for ring in self.rings])
+        return path
@@ -0,0 +1,64 @@
+from scripts.pool import Pool
+from scripts.viewport import NULL_VIEWPORT
+
+PROJECTILE_SPEED = 1.5
+PROJECTILE_LIFETIME = 360 #frames before a projectile that hit nothing disappears
+
+class ProjectilePool(Pool):
+    #all projectiles in a pool instead of a list per projectile
+    FIELDS = ('x', 'y', 'velocity', 'age')
+
+    def __iter__(self):
+        #read-only view for the AI, ((x, y), velocity) per projectile
+        return zip(zip(self.x[:self.count], self.y), self.velocity)
+
+    def spawn(self, pos, velocity):
+        super().spawn(pos[0], pos[1], velocity, 0)
+
+    def update(self, tilemap, target=None):
+        #moves and ages every projectile, dropping the ones that hit a solid tile, expire or hit the target rect (if given);
+        #returns the ((x, y), velocity) of every wall hit and the number of target hits
+        xs, ys, velocities, ages = self.x, self.y, self.velocity, self.age
+        solid = tilemap.solid
+        tile_size = tilemap.tile_size
+        if target:
+            left, top, right, bottom = target.left, target.top, target.right, target.bottom
+        wall_hits = []
+        target_hits = 0
+        for i in self.backwards():
+            x = xs[i] = xs[i] + velocities[i]
+            y = ys[i]
+            ages[i] += 1
+            if (int(x // tile_size), int(y // tile_size)) in solid:
+                wall_hits.append(((x, y), velocities[i]))
+            elif ages[i] > PROJECTILE_LIFETIME:
+                pass
+            elif target and left <= x < right and top <= y < bottom:
+                target_hits += 1
+            else:
+                continue
+            self.remove(i)
+        return wall_hits, target_hits
+
+    def any_within(self, pos, radius):
+        radius_sq = radius * radius
+        for x, y in zip(self.x[:self.count], self.y):
+            if (x - pos[0]) ** 2 + (y - pos[1]) ** 2 < radius_sq:
+                return True
+        return False
+
+    def colliding(self, rect, size=8):
+        #projectiles as size x size boxes against the rect, for the AI's hit tracking
+        half = size / 2
+        for x, y in zip(self.x[:self.count], self.y):
+            if x + half > rect.left and x - half < rect.right and y + half > rect.top and y - half < rect.bottom:
+                return True
+        return False
+
+    def render(self, surf, img, offset=(0, 0), viewport=NULL_VIEWPORT):
+        x_shift = img.get_width() / 2 + offset[0]
+        y_shift = img.get_height() / 2 + offset[1]
+        left, top, right, bottom = viewport.bounds()
+        blits = [(img, (x - x_shift, y - y_shift)) for x, y in zip(self.x[:self.count], self.y) if left < x < right and top < y < bottom]
+        viewport.count('projectiles', len(blits), self.count - len(blits))
+        surf.blits(blits, False)
@@ -2,25 +2,60 @@ import math
 
 import pygame
 
-class Spark:
-    def __init__(self, pos, angle, speed):
-        self.pos = list(pos)
-        self.angle = angle
-        self.speed = speed
-        
+from scripts.pool import Pool
+from scripts.viewport import NULL_VIEWPORT
+
+SPARK_DRAG = 0.1 #speed lost per frame, the spark dies when it reaches 0
+ANGLE_STEPS = 32 #directions the spark sprites are drawn in
+SPEED_STEP = 0.25 #speed difference between cached spark sprites
+
+class SparkSystem(Pool):
+    #every spark in a pool with its direction stored as a unit vector once,
+    #drawn from a cache of pre-rasterized spark shapes keyed by quantized angle and speed instead of a polygon per spark
+    FIELDS = ('x', 'y', 'dx', 'dy', 'speed', 'angle_step')
+
+    def __init__(self):
+        super().__init__()
+        self.sprites = {} #(angle step, speed step) -> (surface, center)
+
+    def spawn(self, pos, angle, speed):
+        super().spawn(pos[0], pos[1], math.cos(angle), math.sin(angle), speed, round(angle / math.tau * ANGLE_STEPS) % ANGLE_STEPS)
+
     def update(self):
-        self.pos[0] += math.cos(self.angle) * self.speed
-        self.pos[1] += math.sin(self.angle) * self.speed
-        
-        self.speed = max(0, self.speed - 0.1)
-        return not self.speed
-    
-    def render(self, surf, offset=(0, 0)):
-        render_points = [
-            (self.pos[0] + math.cos(self.angle) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle) * self.speed * 3 - offset[1]),
-            (self.pos[0] + math.cos(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[1]),
-            (self.pos[0] + math.cos(self.angle + math.pi) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle + math.pi) * self.speed * 3 - offset[1]),
-            (self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[1]),
-        ]
-        
-        pygame.draw.polygon(surf, (255, 255, 255), render_points)
\ No newline at end of file
+        xs, ys, dxs, dys, speeds = self.x, self.y, self.dx, self.dy, self.speed
+        for i in self.backwards():
+            speed = speeds[i]
+            xs[i] += dxs[i] * speed
+            ys[i] += dys[i] * speed
+            speed -= SPARK_DRAG
+            if speed <= 0:
+                self.remove(i)
+            else:
+                speeds[i] = speed
+
+    def sprite(self, angle_step, speed_step):
+        #the old spark polygon: a diamond 3x its speed long and 0.5x its speed wide, drawn around the surface center
+        angle = angle_step / ANGLE_STEPS * math.tau
+        speed = speed_step * SPEED_STEP
+        center = math.ceil(speed * 3) + 1
+        surf = pygame.Surface((center * 2 + 1, center * 2 + 1))
+        surf.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        points = []
+        for turn, length in [(0, 3), (0.5, 0.5), (1, 3), (-0.5, 0.5)]:
+            points.append((center + math.cos(angle + math.pi * turn) * speed * length, center + math.sin(angle + math.pi * turn) * speed * length))
+        pygame.draw.polygon(surf, (255, 255, 255), points)
+        self.sprites[(angle_step, speed_step)] = (surf, center)
+        return self.sprites[(angle_step, speed_step)]
+
+    def render(self, surf, offset=(0, 0), viewport=NULL_VIEWPORT):
+        sprites = self.sprites
+        left, top, right, bottom = viewport.bounds()
+        blits = []
+        for x, y, speed, angle_step in zip(self.x[:self.count], self.y, self.speed, self.angle_step):
+            if not (left < x < right and top < y < bottom):
+                continue
+            speed_step = max(1, round(speed / SPEED_STEP))
+            sprite = sprites.get((angle_step, speed_step)) or self.sprite(angle_step, speed_step)
+            blits.append((sprite[0], (x - offset[0] - sprite[1], y - offset[1] - sprite[1])))
+        viewport.count('sparks', len(blits), self.count - len(blits))
+        surf.blits(blits, False)
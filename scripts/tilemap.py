@@ -1,5 +1,8 @@
 #note that pygame origin coordinate is top left so coordinates act inversely
+import bisect
 import json
+import mmap
+import struct
 
 import pygame
 
@@ -15,93 +18,425 @@ AUTOTILE_MAP = {
     tuple(sorted([(1, 0), (-1, 0), (0, 1), (0, -1)])): 8,
 }
 
+#autotiling packs the same-type neighbours of a tile into a 4 bit mask
+AUTOTILE_BITS = {(1, 0): 1, (-1, 0): 2, (0, -1): 4, (0, 1): 8}
+AUTOTILE_MASKS = {sum(AUTOTILE_BITS[shift] for shift in neighbours): variant for neighbours, variant in AUTOTILE_MAP.items()}
+
 NEIGHBOUR_OFFSETS = [(-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (0, 0), (-1, 1), (0, 1), (1, 1)]
+TILE_TYPES = ['decor', 'grass', 'large_decor', 'stone'] #the tile sets drawn from Assets/images/tiles, spawners are taken out of the map on load
 PHYSICS_TILES =  {'grass', 'stone'}
 AUTOTILE_TYPES = {'grass', 'stone'}
+CHUNK_SIZE = 256 #pixel size of the cached surfaces static tiles are baked into
+TOPS_BUCKET = 16 #platform tops are bucketed in squares of this many tiles for area queries
+
+#binary map layout (little endian):
+#header | palette of (type, variant) pairs | width * height grid of palette indices (0 = empty) | offgrid table
+MAP_EXT = '.map'
+MAP_MAGIC = b'HPMP'
+MAP_VERSION = 1
+MAP_HEADER = struct.Struct('<4sHHiiIIHI') #magic, version, tile size, origin x, origin y, width, height, palette size, offgrid count
+MAP_PALETTE_ENTRY = struct.Struct('<HB') #variant, type name length, followed by the utf-8 type name
+MAP_OFFGRID_ENTRY = struct.Struct('<Hdd') #palette index, x, y
 
 class Tilemap:
     def __init__(self, game, tile_size=16):
         self.game = game
         self.tile_size = tile_size
-        self.tilemap = {}
+        self.grid = {} #(x, y) -> (type, variant), used for every lookup
+        self.solid = set() #locations of the grid tiles that are in PHYSICS_TILES
+        self.columns = {} #tile x -> sorted tile ys of the solid tiles in that column
+        self.platform_tops = {} #bucket -> set of solid tile locations with no solid tile above them
+        self.tilemap_view = None #lazily built 'x;y' keyed json view of the grid, see the tilemap property
         self.offgrid_tiles = []
+        self.chunks = {} #(chunk x, chunk y) -> baked surface, or None when the chunk is empty
+        self.template = None #the level template the tilemap currently matches, if any
+        self.physics_rects = {} #tile loc -> rects of the solid tiles around it, shared and never mutated
+        self.grid_by_type = {} #(type, variant) -> {tile loc: None}, an ordered set of grid tiles
+        #offgrid tiles are indexed by a sequence number that follows their order in offgrid_tiles
+        self.offgrid_keys = {} #id(tile) -> sequence number
+        self.offgrid_by_type = {} #(type, variant) -> {sequence number: tile}
+        self.offgrid_buckets = {} #chunk holding the tile's top left corner -> {sequence number: tile}
+        self.offgrid_seq = 0
+
+    @property
+    def tilemap(self):
+        #read only, edits go through set_tile/remove_tile
+        if self.tilemap_view is None:
+            self.tilemap_view = {}
+            for loc, tile in self.grid.items():
+                self.tilemap_view[str(loc[0]) + ';' + str(loc[1])] = {'type': tile[0], 'variant': tile[1], 'pos': [loc[0], loc[1]]}
+        return self.tilemap_view
 
     def extract(self, id_pairs, keep=False):
         matches = []
-        for tile in self.offgrid_tiles.copy():
-            if (tile['type'], tile['variant']) in id_pairs:
-                matches.append(tile.copy())
-                if not keep:
-                    self.offgrid_tiles.remove(tile)
+        found = {}
+        for pair in id_pairs:
+            found.update(self.offgrid_by_type.get(pair, {}))
+        for seq in sorted(found):
+            matches.append(found[seq].copy())
+        if found and not keep:
+            self.remove_offgrid_tiles(found.values())
                     
-        for loc in self.tilemap:
-            tile = self.tilemap[loc]
-            if (tile['type'], tile['variant']) in id_pairs:
-                matches.append(tile.copy())
-                matches[-1]['pos'] = matches[-1]['pos'].copy()
-                matches[-1]['pos'][0] *= self.tile_size
-                matches[-1]['pos'][1] *= self.tile_size
+        for pair in id_pairs:
+            for loc in list(self.grid_by_type.get(pair, {})):
+                matches.append({'type': pair[0], 'variant': pair[1], 'pos': [loc[0] * self.tile_size, loc[1] * self.tile_size]})
                 if not keep:
-                    del self.tilemap[loc]
+                    self.remove_tile(loc)
         
         return matches
     
     def tiles_around(self, pos):
         tiles = []
-        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        tile_x = int(pos[0] // self.tile_size)
+        tile_y = int(pos[1] // self.tile_size)
+        grid = self.grid
         for offset in NEIGHBOUR_OFFSETS:
-            check_loc = str(tile_loc[0] + offset[0]) +  ';' + str(tile_loc[1] + offset[1])
-            if check_loc in self.tilemap:
-                tiles.append(self.tilemap[check_loc])
+            loc = (tile_x + offset[0], tile_y + offset[1])
+            if loc in grid:
+                tiles.append({'type': grid[loc][0], 'variant': grid[loc][1], 'pos': [loc[0], loc[1]]})
         return tiles
     
+    def apply_template(self, template):
+        #nothing to do on a respawn, the tilemap (and its baked chunks) still match the level
+        if self.template is template:
+            return
+        self.grid = dict(template.grid)
+        self.tile_size = template.tile_size
+        self.offgrid_tiles = list(template.offgrid_tiles)
+        self.reindex()
+        self.template = template
+
+    def reindex(self):
+        #rebuilds every cache and index after the whole map was replaced
+        self.tilemap_view = None
+        self.chunks = {}
+        self.physics_rects = {}
+        self.template = None
+
+        self.grid_by_type = {}
+        for loc, tile in self.grid.items():
+            self.grid_by_type.setdefault(tile, {})[loc] = None
+        self.solid = {loc for loc, tile in self.grid.items() if tile[0] in PHYSICS_TILES}
+
+        self.columns = {}
+        for loc in self.solid:
+            self.columns.setdefault(loc[0], []).append(loc[1])
+        for column in self.columns.values():
+            column.sort()
+        self.platform_tops = {}
+        for loc in self.solid:
+            if (loc[0], loc[1] - 1) not in self.solid:
+                self.platform_tops.setdefault((loc[0] // TOPS_BUCKET, loc[1] // TOPS_BUCKET), set()).add(loc)
+
+        self.offgrid_keys = {}
+        self.offgrid_by_type = {}
+        self.offgrid_buckets = {}
+        self.offgrid_seq = 0
+        for tile in self.offgrid_tiles:
+            self.index_offgrid(tile)
+
+    def index_offgrid(self, tile):
+        seq = self.offgrid_seq
+        self.offgrid_seq += 1
+        self.offgrid_keys[id(tile)] = seq
+        self.offgrid_by_type.setdefault((tile['type'], tile['variant']), {})[seq] = tile
+        self.offgrid_buckets.setdefault((int(tile['pos'][0] // CHUNK_SIZE), int(tile['pos'][1] // CHUNK_SIZE)), {})[seq] = tile
+
+    def add_offgrid_tile(self, tile):
+        self.offgrid_tiles.append(tile)
+        self.index_offgrid(tile)
+        self.invalidate_offgrid(tile)
+
+    def remove_offgrid_tiles(self, tiles):
+        removed = set()
+        for tile in tiles:
+            seq = self.offgrid_keys.pop(id(tile))
+            del self.offgrid_by_type[(tile['type'], tile['variant'])][seq]
+            del self.offgrid_buckets[(int(tile['pos'][0] // CHUNK_SIZE), int(tile['pos'][1] // CHUNK_SIZE))][seq]
+            removed.add(id(tile))
+            self.invalidate_offgrid(tile)
+        #one filtering pass instead of a list.remove per tile
+        self.offgrid_tiles = [tile for tile in self.offgrid_tiles if id(tile) not in removed]
+
+    def set_tile(self, loc, tile_type, variant):
+        loc = (loc[0], loc[1])
+        self.remove_tile(loc)
+        self.grid[loc] = (tile_type, variant)
+        self.grid_by_type.setdefault(self.grid[loc], {})[loc] = None
+        if tile_type in PHYSICS_TILES:
+            self.solid.add(loc)
+            bisect.insort(self.columns.setdefault(loc[0], []), loc[1])
+            self.update_platform_tops(loc)
+        self.invalidate_tile(loc)
+
+    def remove_tile(self, loc):
+        loc = (loc[0], loc[1])
+        tile = self.grid.pop(loc, None)
+        if tile:
+            del self.grid_by_type[tile][loc]
+            if loc in self.solid:
+                self.solid.remove(loc)
+                self.columns[loc[0]].remove(loc[1])
+                self.update_platform_tops(loc)
+            self.invalidate_tile(loc)
+        return tile
+
+    def update_platform_tops(self, loc):
+        #a change at loc can only make or break the tops at loc and right below it
+        for check_loc in [loc, (loc[0], loc[1] + 1)]:
+            bucket = self.platform_tops.setdefault((check_loc[0] // TOPS_BUCKET, check_loc[1] // TOPS_BUCKET), set())
+            if check_loc in self.solid and (check_loc[0], check_loc[1] - 1) not in self.solid:
+                bucket.add(check_loc)
+            else:
+                bucket.discard(check_loc)
+
+    def invalidate_tile(self, loc):
+        self.tilemap_view = None
+        self.template = None
+        for offset in NEIGHBOUR_OFFSETS:
+            self.physics_rects.pop((loc[0] - offset[0], loc[1] - offset[1]), None)
+        self.chunks.pop((loc[0] * self.tile_size // CHUNK_SIZE, loc[1] * self.tile_size // CHUNK_SIZE), None)
+
+    def invalidate_offgrid(self, tile):
+        #decor images are smaller than a chunk, so they can only hang over into the chunks right of and below their own
+        self.template = None
+        chunk_x = int(tile['pos'][0] // CHUNK_SIZE)
+        chunk_y = int(tile['pos'][1] // CHUNK_SIZE)
+        for chunk_loc in [(chunk_x, chunk_y), (chunk_x + 1, chunk_y), (chunk_x, chunk_y + 1), (chunk_x + 1, chunk_y + 1)]:
+            self.chunks.pop(chunk_loc, None)
+
     def save(self, path):
         f = open(path, 'w')
         json.dump({'tilemap' : self.tilemap, 'tile_size' : self.tile_size, 'offgrid' : self.offgrid_tiles}, f)
-        f.close
+        f.close()
+
+    def save_binary(self, path):
+        palette = {}
+        for tile in list(self.grid.values()) + [(tile['type'], tile['variant']) for tile in self.offgrid_tiles]:
+            palette.setdefault(tile, len(palette) + 1)
+        if len(palette) > 255:
+            raise ValueError('binary maps support at most 255 distinct (type, variant) pairs')
+
+        if self.grid:
+            origin = (min(loc[0] for loc in self.grid), min(loc[1] for loc in self.grid))
+            width = max(loc[0] for loc in self.grid) - origin[0] + 1
+            height = max(loc[1] for loc in self.grid) - origin[1] + 1
+        else:
+            origin, width, height = (0, 0), 0, 0
+
+        cells = bytearray(width * height)
+        for loc, tile in self.grid.items():
+            cells[(loc[1] - origin[1]) * width + loc[0] - origin[0]] = palette[tile]
+
+        f = open(path, 'wb')
+        f.write(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, self.tile_size, origin[0], origin[1], width, height, len(palette), len(self.offgrid_tiles)))
+        for (tile_type, variant) in palette:
+            name = tile_type.encode('utf-8')
+            f.write(MAP_PALETTE_ENTRY.pack(variant, len(name)) + name)
+        f.write(cells)
+        for tile in self.offgrid_tiles:
+            f.write(MAP_OFFGRID_ENTRY.pack(palette[(tile['type'], tile['variant'])], tile['pos'][0], tile['pos'][1]))
+        f.close()
+
+    def load_binary(self, path):
+        f = open(path, 'rb')
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, tile_size, origin_x, origin_y, width, height, palette_size, offgrid_count = MAP_HEADER.unpack_from(data, 0)
+            if magic != MAP_MAGIC or version != MAP_VERSION:
+                raise ValueError(path + ' is not a version ' + str(MAP_VERSION) + ' binary map')
+            cursor = MAP_HEADER.size
+
+            palette = [None]
+            for i in range(palette_size):
+                variant, name_length = MAP_PALETTE_ENTRY.unpack_from(data, cursor)
+                cursor += MAP_PALETTE_ENTRY.size
+                palette.append((data[cursor:cursor + name_length].decode('utf-8'), variant))
+                cursor += name_length
+
+            #every cell refers to a shared palette tuple, so no per-tile objects are built
+            grid = {}
+            for row in range(height):
+                y = origin_y + row
+                cells = data[cursor:cursor + width]
+                cursor += width
+                for i, index in enumerate(cells):
+                    if index:
+                        grid[(origin_x + i, y)] = palette[index]
+
+            offgrid_tiles = []
+            for index, x, y in MAP_OFFGRID_ENTRY.iter_unpack(data[cursor:cursor + offgrid_count * MAP_OFFGRID_ENTRY.size]):
+                offgrid_tiles.append({'type': palette[index][0], 'variant': palette[index][1], 'pos': [x, y]})
+        finally:
+            data.close()
+            f.close()
+
+        self.grid = grid
+        self.tile_size = tile_size
+        self.offgrid_tiles = offgrid_tiles
+        self.reindex()
 
     def load(self, path):
+        if path.endswith(MAP_EXT):
+            return self.load_binary(path)
+
         f = open(path, 'r')
         map_data = json.load(f)
         f.close()
 
-        self.tilemap = map_data['tilemap']
+        self.grid = {(tile['pos'][0], tile['pos'][1]): (tile['type'], tile['variant']) for tile in map_data['tilemap'].values()}
         self.tile_size = map_data['tile_size'] 
         self.offgrid_tiles = map_data['offgrid']
+        self.reindex()
 
     def solid_check(self, pos):
-        tile_loc = str(int(pos[0] // self.tile_size)) + ';' + str(int(pos[1] // self.tile_size))
-        if tile_loc in self.tilemap:
-            if self.tilemap[tile_loc]['type'] in PHYSICS_TILES:
-                return self.tilemap[tile_loc] 
+        tile = self.grid.get((int(pos[0] // self.tile_size), int(pos[1] // self.tile_size)))
+        if tile and tile[0] in PHYSICS_TILES:
+            return tile
+
+    def solid_check_many(self, points):
+        #one bool per point, for probes that test many points at once; any sequence of (x, y) pairs works, numpy arrays included
+        solid = self.solid
+        tile_size = self.tile_size
+        return [(int(x // tile_size), int(y // tile_size)) in solid for x, y in points]
+
+    def first_solid(self, pos, step, count):
+        #index of the first solid point of the ray pos, pos + step, pos + 2 * step, ... (count points), or None
+        solid = self.solid
+        tile_size = self.tile_size
+        for i in range(count):
+            if (int((pos[0] + step[0] * i) // tile_size), int((pos[1] + step[1] * i) // tile_size)) in solid:
+                return i
+        return None
+
+    def solid_below(self, pos):
+        #tile y of the first solid tile at or below pos in its column, or None over a bottomless column
+        column = self.columns.get(int(pos[0] // self.tile_size))
+        if column:
+            i = bisect.bisect_left(column, int(pos[1] // self.tile_size))
+            if i < len(column):
+                return column[i]
+        return None
+
+    def ground_distance(self, pos):
+        #pixels from pos down to the top of the ground below it (0 inside a solid tile), or None
+        tile_y = self.solid_below(pos)
+        if tile_y is None:
+            return None
+        return max(0, tile_y * self.tile_size - pos[1])
+
+    def platform_tops_in(self, rect):
+        #tile locations of the walkable tops (solid with air above) whose tile overlaps the pixel rect
+        left = int(rect[0] // self.tile_size)
+        top = int(rect[1] // self.tile_size)
+        right = int((rect[0] + rect[2] - 1) // self.tile_size)
+        bottom = int((rect[1] + rect[3] - 1) // self.tile_size)
+        tops = []
+        for bucket_x in range(left // TOPS_BUCKET, right // TOPS_BUCKET + 1):
+            for bucket_y in range(top // TOPS_BUCKET, bottom // TOPS_BUCKET + 1):
+                for loc in self.platform_tops.get((bucket_x, bucket_y), ()):
+                    if left <= loc[0] <= right and top <= loc[1] <= bottom:
+                        tops.append(loc)
+        return tops
 
     def physics_rects_around(self, pos):
-        rects = []
-        for tile in self.tiles_around(pos):
-            if tile['type'] in PHYSICS_TILES:
-                rects.append(pygame.Rect(tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size, self.tile_size, self.tile_size))
+        #called twice per entity per frame, so the rects are built once per tile and reused
+        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        rects = self.physics_rects.get(tile_loc)
+        if rects is None:
+            rects = []
+            for offset in NEIGHBOUR_OFFSETS:
+                loc = (tile_loc[0] + offset[0], tile_loc[1] + offset[1])
+                tile = self.grid.get(loc)
+                if tile and tile[0] in PHYSICS_TILES:
+                    rects.append(pygame.Rect(loc[0] * self.tile_size, loc[1] * self.tile_size, self.tile_size, self.tile_size))
+            rects = tuple(rects)
+            if rects: #empty results are not kept, so endless falls through the void do not grow the cache
+                self.physics_rects[tile_loc] = rects
         return rects
     
-    def autotile(self):
-        for loc in self.tilemap:
-            tile = self.tilemap[loc]
-            neighbours = set()
-            for shift in [(1, 0), (-1, 0), (0, -1), (0, 1)]:
-                check_loc = str(tile['pos'][0] + shift[0]) + ';' + str(tile['pos'][1] + shift[1])
-                if check_loc in self.tilemap:
-                    if self.tilemap[check_loc]['type'] == tile['type']:
-                        neighbours.add(shift)
-            neighbours = tuple(sorted(neighbours))
-            if (tile['type'] in AUTOTILE_TYPES) and (neighbours in AUTOTILE_MAP):
-                tile['variant'] = AUTOTILE_MAP[neighbours]
+    def autotile(self, locs=None):
+        #without locs the whole map is retiled, otherwise only the given tiles and the neighbours they affect
+        if locs is None:
+            self.autotile_all()
+            return
+
+        affected = set()
+        for loc in locs:
+            affected.add((loc[0], loc[1]))
+            for shift in AUTOTILE_BITS:
+                affected.add((loc[0] + shift[0], loc[1] + shift[1]))
+        for loc in affected:
+            tile = self.grid.get(loc)
+            if tile and tile[0] in AUTOTILE_TYPES:
+                mask = 0
+                for shift, bit in AUTOTILE_BITS.items():
+                    check_tile = self.grid.get((loc[0] + shift[0], loc[1] + shift[1]))
+                    if check_tile and check_tile[0] == tile[0]:
+                        mask |= bit
+                if mask in AUTOTILE_MASKS and AUTOTILE_MASKS[mask] != tile[1]:
+                    self.set_tile(loc, tile[0], AUTOTILE_MASKS[mask])
+
+    def autotile_all(self):
+        #each row of a tile type is one int bitset, so the neighbour masks of a whole row come from a few shifts
+        if not self.grid:
+            return
+        min_x = min(loc[0] for loc in self.grid)
+        rows = {}
+        for loc, tile in self.grid.items():
+            if tile[0] in AUTOTILE_TYPES:
+                row_key = (tile[0], loc[1])
+                rows[row_key] = rows.get(row_key, 0) | (1 << (loc[0] - min_x))
+
+        for (tile_type, y), row in rows.items():
+            east = row & (row >> 1)
+            west = row & (row << 1)
+            north = row & rows.get((tile_type, y - 1), 0)
+            south = row & rows.get((tile_type, y + 1), 0)
+            while row:
+                bit = row & -row
+                row ^= bit
+                mask = (1 if east & bit else 0) | (2 if west & bit else 0) | (4 if north & bit else 0) | (8 if south & bit else 0)
+                if mask in AUTOTILE_MASKS:
+                    self.grid[(min_x + bit.bit_length() - 1, y)] = (tile_type, AUTOTILE_MASKS[mask])
+        self.reindex()
+
+    def bake_chunk(self, chunk_loc):
+        chunk_rect = pygame.Rect(chunk_loc[0] * CHUNK_SIZE, chunk_loc[1] * CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+        surf = None
+        blits = []
+
+        #the decor that can reach into this chunk starts in it or in the chunks above/left of it, drawn in list order
+        nearby = {}
+        for bucket_loc in [(chunk_loc[0] - 1, chunk_loc[1] - 1), (chunk_loc[0], chunk_loc[1] - 1), (chunk_loc[0] - 1, chunk_loc[1]), chunk_loc]:
+            nearby.update(self.offgrid_buckets.get(bucket_loc, {}))
+        for seq in sorted(nearby):
+            tile = nearby[seq]
+            img = self.game.assets[tile['type']][tile['variant']]
+            if chunk_rect.colliderect(pygame.Rect(tile['pos'][0], tile['pos'][1], img.get_width(), img.get_height())):
+                blits.append((img, (tile['pos'][0] - chunk_rect.x, tile['pos'][1] - chunk_rect.y)))
+
+        tiles_per_chunk = CHUNK_SIZE // self.tile_size
+        for x in range(chunk_loc[0] * tiles_per_chunk, (chunk_loc[0] + 1) * tiles_per_chunk):
+            for y in range(chunk_loc[1] * tiles_per_chunk, (chunk_loc[1] + 1) * tiles_per_chunk):
+                tile = self.grid.get((x, y))
+                if tile:
+                    blits.append((self.game.assets[tile[0]][tile[1]], (x * self.tile_size - chunk_rect.x, y * self.tile_size - chunk_rect.y)))
+
+        if blits:
+            #tile images are colorkeyed on black, so the chunk is too
+            surf = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE))
+            surf.set_colorkey((0, 0, 0))
+            surf.blits(blits, doreturn=False)
+        return surf
 
     def render(self, surf, offset=(0, 0)):
-        for tile in self.offgrid_tiles:
-            surf.blit(self.game.assets[tile['type']][tile['variant']], (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1]))
-
-        for x in range(offset[0] // self.tile_size, (offset[0] + surf.get_width()) // self.tile_size + 1):
-            for y in range(offset[1] // self.tile_size, (offset[1] + surf.get_height()) // self.tile_size + 1):
-                loc = str(x) + ';' + str(y)
-                if loc in self.tilemap:
-                    tile = self.tilemap[loc]
-                    surf.blit(self.game.assets[tile['type']][tile['variant']], (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))        
\ No newline at end of file
+        blits = []
+        for cx in range(offset[0] // CHUNK_SIZE, (offset[0] + surf.get_width()) // CHUNK_SIZE + 1):
+            for cy in range(offset[1] // CHUNK_SIZE, (offset[1] + surf.get_height()) // CHUNK_SIZE + 1):
+                if (cx, cy) not in self.chunks:
+                    self.chunks[(cx, cy)] = self.bake_chunk((cx, cy))
+                chunk = self.chunks[(cx, cy)]
+                if chunk:
+                    blits.append((chunk, (cx * CHUNK_SIZE - offset[0], cy * CHUNK_SIZE - offset[1])))
+        surf.blits(blits, doreturn=False)
@@ -0,0 +1,29 @@
+import math
+
+import pygame
+
+TRANSITION_FRAMES = 60 #frames the iris takes to open or close
+IRIS_SPEED = 8 #pixels the iris radius changes per frame
+
+class IrisTransition:
+    #the black iris closing over the display on level loads and respawns, drawn through one reused surface:
+    #black with the open circle in the colorkey, where only the circle's change since last frame is redrawn
+    def __init__(self, size):
+        self.surf = pygame.Surface(size)
+        self.surf.set_colorkey((255, 255, 255))
+        self.center = (size[0] // 2, size[1] // 2)
+        self.open_radius = math.hypot(self.center[0], self.center[1]) + 1 #past this the circle covers the whole display
+        self.radius = 0 #of the circle on self.surf
+
+    def render(self, surf, transition):
+        radius = (TRANSITION_FRAMES - abs(transition)) * IRIS_SPEED
+        if not transition or radius > self.open_radius:
+            return
+        if radius <= 0:
+            surf.fill((0, 0, 0))
+            return
+        if radius < self.radius:
+            pygame.draw.circle(self.surf, (0, 0, 0), self.center, self.radius)
+        pygame.draw.circle(self.surf, (255, 255, 255), self.center, radius)
+        self.radius = radius
+        surf.blit(self.surf, (0, 0))
@@ -1,8 +1,10 @@
 import pygame
 
 import os
+from collections import OrderedDict
 
 BASE_IMG_PATH = 'Assets/images/'
+FONT_PATH = 'Assets/font.ttf'
 
 def load_image(path):
     img = pygame.image.load(BASE_IMG_PATH + path).convert()
@@ -16,15 +18,16 @@ def load_images(path):
     return images
 
 class Animation:
-    def __init__(self, images, img_dur=5, loop=True):
+    def __init__(self, images, img_dur=5, loop=True, flipped_images=None):
         self.images = images
+        self.flipped_images = flipped_images or [pygame.transform.flip(img, True, False) for img in images] #mirrored once here instead of every render
         self.loop = loop
         self.img_duration = img_dur
         self.done = False
         self.frame = 0
 
     def copy(self):
-        return Animation(self.images, self.img_duration, self.loop)
+        return Animation(self.images, self.img_duration, self.loop, self.flipped_images)
     
     def update(self):
         if self.loop:
@@ -34,5 +37,27 @@ class Animation:
             if self.frame >= self.img_duration *  len(self.images) - 1:
                  self.done = True
 
-    def img(self):
-        return self.images[int(self.frame / self.img_duration)]
\ No newline at end of file
+    def img(self, flip=False):
+        return (self.flipped_images if flip else self.images)[int(self.frame / self.img_duration)]
+
+class TextCache:
+    #rendered text keyed by (font, size, string, colour), fonts are loaded once per size
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.fonts = {}
+        self.surfaces = OrderedDict() #least recently used first
+
+    def font(self, size, path=FONT_PATH):
+        if (path, size) not in self.fonts:
+            self.fonts[(path, size)] = pygame.font.Font(path, size)
+        return self.fonts[(path, size)]
+
+    def render(self, text, size, color, path=FONT_PATH, antialias=True):
+        key = (path, size, text, color, antialias)
+        if key in self.surfaces:
+            self.surfaces.move_to_end(key)
+        else:
+            self.surfaces[key] = self.font(size, path).render(text, antialias, color)
+            if len(self.surfaces) > self.maxsize:
+                self.surfaces.popitem(last=False)
+        return self.surfaces[key]
@@ -0,0 +1,51 @@
+import math
+
+import pygame
+
+CULL_MARGIN = 32 #pixels past the display edge an object's position can be and still reach into it (the largest spark is 20 pixels from its center)
+
+class Viewport:
+    #the part of the level the camera shows this rendered frame, grown by the margin, so what lies outside it is not drawn at all.
+    #Only drawing is skipped, everything is still updated. Counts how many objects of each kind were drawn and culled in the last frame
+    def __init__(self, size, margin=CULL_MARGIN):
+        self.size = size
+        self.margin = margin
+        self.rect = pygame.Rect(0, 0, size[0] + margin * 2, size[1] + margin * 2)
+        self.left = self.top = self.right = self.bottom = 0
+        self.drawn = {} #kind -> objects drawn in the last frame
+        self.culled = {} #kind -> objects skipped in the last frame
+
+    def move(self, offset):
+        #called once per rendered frame with the render scroll, before anything is drawn
+        self.rect.topleft = (offset[0] - self.margin, offset[1] - self.margin)
+        self.left, self.top, self.right, self.bottom = self.rect.left, self.rect.top, self.rect.right, self.rect.bottom
+        self.drawn.clear()
+        self.culled.clear()
+
+    def bounds(self):
+        #for the pools, which cull by position alone: a position is drawn when left < x < right and top < y < bottom
+        return self.left, self.top, self.right, self.bottom
+
+    def sees(self, rect, kind):
+        #whether an object with this rect gets drawn, counted under kind
+        seen = self.rect.colliderect(rect)
+        counts = self.drawn if seen else self.culled
+        counts[kind] = counts.get(kind, 0) + 1
+        return seen
+
+    def count(self, kind, drawn, culled):
+        self.drawn[kind] = self.drawn.get(kind, 0) + drawn
+        self.culled[kind] = self.culled.get(kind, 0) + culled
+
+    def totals(self):
+        return sum(self.drawn.values()), sum(self.culled.values())
+
+class NullViewport:
+    #what the pools render against when not given a viewport, one shared instance that sees everywhere and counts nothing
+    def bounds(self):
+        return -math.inf, -math.inf, math.inf, math.inf
+
+    def count(self, kind, drawn, culled):
+        pass
+
+NULL_VIEWPORT = NullViewport()